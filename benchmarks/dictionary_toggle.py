@@ -0,0 +1,64 @@
+"""Latency of toggling one dictionary with 30 loaded.
+
+Runs dictionary_toggle.toggle_dictionary against a fake engine holding a
+real plover Config, saved to a temporary file, and 30 loaded dictionaries.
+The dictionaries_loaded listener is a no-op, so this is the cost of the
+toggle itself; the config file write is timed separately for reference.
+"""
+
+from tempfile import TemporaryDirectory
+from threading import RLock
+import os
+
+from plover.config import Config, DictionaryConfig
+from plover.steno_dictionary import StenoDictionary, StenoDictionaryCollection
+
+from plover_mac_ui.dictionary_toggle import toggle_dictionary
+
+from benchmarks.timing import header, measure, report
+
+DICTIONARY_COUNT = 30
+ENTRIES = 2000
+
+class FakeEngine:
+  def __init__(self, config, dicts):
+    self._config = config
+    self._lock = RLock()
+    self.dictionaries = StenoDictionaryCollection(dicts)
+
+  def __enter__(self):
+    self._lock.acquire()
+    return self
+
+  def __exit__(self, *exc):
+    self._lock.release()
+
+  @property
+  def config(self):
+    return {"dictionaries": self._config["dictionaries"]}
+
+  def _update(self, config):
+    raise AssertionError("every benchmarked dictionary is loaded")
+
+  def _trigger_hook(self, hook, *args):
+    pass
+
+def make_dictionary(path, n):
+  d = StenoDictionary()
+  d.path = path
+  d.update(((f"TK{n}/{i}",), f"word{i}") for i in range(ENTRIES))
+  return d
+
+def main(repeat=500):
+  with TemporaryDirectory() as tmp:
+    config = Config(os.path.join(tmp, "plover.cfg"))
+    paths = [os.path.join(tmp, f"dict{n}.json") for n in range(DICTIONARY_COUNT)]
+    config.update(dictionaries=[DictionaryConfig(path) for path in paths])
+    engine = FakeEngine(config, [make_dictionary(path, n) for n, path in enumerate(paths)])
+
+    header(f"toggle one of {DICTIONARY_COUNT} loaded dictionaries")
+    report("toggle_dictionary", measure(lambda: toggle_dictionary(engine, 15), repeat))
+    report("  of which Config.save", measure(config.save, repeat))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,57 @@
+"""Planning cost of improved keyboard emulation output.
+
+Times how long it takes to turn a string into text and Return events,
+comparing the old recursive send_string splitting with
+emulation.plan_chunks and with ChunkedSender.send, which improved mode
+uses, at the default fixed chunk size. All of them send to no-op
+callbacks, so only the planning is measured.
+"""
+
+from plover_mac_ui.emulation import CHUNK_SIZE, ChunkedSender, plan_chunks
+from plover_mac_ui.utils import every
+
+from benchmarks.timing import header, measure, report
+
+# KeyboardEmulation.send_string before user-037.
+def old_send_string(s, send_text, send_return, limit=CHUNK_SIZE):
+  if "\n" in s:
+    parts = s.split("\n")
+    parts = sum([[part, "\n"] for part in parts[:-1]], []) + [parts[-1]]
+    for part in parts:
+      if not part:
+        continue
+      if part == "\n":
+        send_return()
+      else:
+        old_send_string(part, send_text, send_return, limit)
+    return
+  for substr in every(limit, s):
+    send_text(substr)
+
+def new_send_string(s, send_text, send_return):
+  for chunk in plan_chunks(s):
+    if chunk == "\n":
+      send_return()
+    else:
+      send_text(chunk)
+
+def ignore(*args):
+  pass
+
+CASES = [
+  ("one word", "hello ", 20000),
+  ("200-character line", "lorem ipsum dolor sit amet " * 7 + "lorem ", 20000),
+  ("5 KB macro, 400 lines", "\n".join(
+    f"line {i}: " + "boilerplate " * (i % 9) for i in range(400)), 200),
+]
+
+def main():
+  sender = ChunkedSender(ignore, ignore)
+  for name, s, repeat in CASES:
+    header(f"{name} ({len(s)} characters)")
+    report("recursive split (before)", measure(lambda: old_send_string(s, ignore, ignore), repeat))
+    report("plan_chunks", measure(lambda: new_send_string(s, ignore, ignore), repeat))
+    report("ChunkedSender.send", measure(lambda: sender.send(s), repeat))
+
+if __name__ == "__main__":
+  main()
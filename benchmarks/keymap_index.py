@@ -0,0 +1,60 @@
+"""Config-change cost of the layout display's keymap index.
+
+Builds key_actions and the reverse keymap for the Qwerty layout display
+from a real Keymap, the way DisplayController.configDidChange_ does, and
+compares it with the previous per-view scan of the whole keymap.
+"""
+
+from plover.machine.keymap import Keymap
+from plover.system import english_stenotype
+
+from plover_mac_ui.keymap_index import build_index, view_state
+
+from benchmarks.timing import header, measure, report
+
+# The keys QwertyDisplayController.configureKeymap binds to a view.
+QWERTY_KEYS = tuple("1234567890-=[];'\\,./") + ("space",) + tuple("abcdefghijklmnopqrstuvwxyz")
+
+class FakeKeyView:
+  def __init__(self, name):
+    self.name = name
+    self.disabled = False
+    self.fullLabel = ""
+
+def qwerty_keymap():
+  bindings = english_stenotype.KEYMAPS["Keyboard"]
+  actions = [action for action in bindings if action != "no-op"]
+  keymap = Keymap(QWERTY_KEYS, actions)
+  keymap.set_mappings(bindings)
+  return keymap
+
+def single_pass(keymap, machine_keymap):
+  key_actions, reverse_keymap = build_index(keymap, machine_keymap)
+  for view, keys in reverse_keymap.items():
+    view.disabled, view.fullLabel = view_state([key_actions[key] for key in keys])
+
+# configDidChange_ before user-030.
+def per_view_scan(keymap, machine_keymap):
+  reverse_keymap = {
+    view: [key for key in keymap if keymap[key] == view]
+    for view in keymap.values()
+  }
+  noops = {view for view, keys in reverse_keymap.items()
+    if all(machine_keymap.get_action(key) in {None, "no-op"} for key in keys)}
+  for view in reverse_keymap:
+    view.disabled = view in noops
+    labels = {machine_keymap.get_action(key) for key in reverse_keymap[view]}
+    labels.discard(None)
+    view.fullLabel = list(labels)[0] if labels else ""
+
+def main(repeat=5000):
+  machine_keymap = qwerty_keymap()
+  keymap = {key: FakeKeyView(key) for key in QWERTY_KEYS}
+  header(f"Qwerty layout display, {len(keymap)} key views, one config change")
+  report("single pass (build_index + view_state)",
+    measure(lambda: single_pass(keymap, machine_keymap), repeat))
+  report("per-view scan (before)",
+    measure(lambda: per_view_scan(keymap, machine_keymap), repeat))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,53 @@
+"""Script classification cost for word list and translation rows.
+
+Classifies a mix of Latin, Korean and Chinese/Japanese strings the way
+the *_font helpers in fonts.py do for every row and label, comparing the
+old two-predicate scan with scripts.script_of, uncached and memoized.
+"""
+
+from random import Random
+
+from plover_mac_ui.scripts import Script, script_of
+
+from benchmarks.timing import header, measure, report
+
+ROWS = 2000
+
+# fonts.steno_font before user-027: is_zh_ja rescans the text via is_korean.
+def old_is_korean(text):
+  return any(ord(c) in range(0x3130, 0x3190) for c in text)
+
+def old_is_zh_ja(text):
+  return any(ord(c) > 0x3000 for c in text) and not old_is_korean(text)
+
+def old_classify(text):
+  return Script.KOREAN if old_is_korean(text) else \
+    Script.ZH_JA if old_is_zh_ja(text) else Script.LATIN
+
+def make_rows(rng):
+  latin = "abcdefghijklmnopqrstuvwxyz"
+  korean = [chr(c) for c in range(0x3131, 0x318f)]
+  zh_ja = [chr(c) for c in range(0x4e00, 0x4e80)] + [chr(c) for c in range(0x3041, 0x3097)]
+  rows = []
+  for i in range(ROWS):
+    alphabet = (latin, latin, korean, zh_ja)[i % 4]
+    rows.append("".join(rng.choices(alphabet, k=rng.randint(2, 24))))
+  return rows
+
+def classify_all(classify, rows):
+  for row in rows:
+    classify(row)
+
+def main(repeat=200):
+  rows = make_rows(Random(27))
+  # A word list redraws the same rows, so most calls hit the memo.
+  script_of.cache_clear()
+  classify_all(script_of, rows)
+  header(f"classify {ROWS} rows (half Latin, a quarter each Korean and zh/ja)")
+  report("two predicates (before)", measure(lambda: classify_all(old_classify, rows), repeat))
+  report("script_of, single pass uncached",
+    measure(lambda: classify_all(script_of.__wrapped__, rows), repeat))
+  report("script_of, memoized", measure(lambda: classify_all(script_of, rows), repeat))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,85 @@
+"""Cost of redrawing the suggestions tape per translated word.
+
+Feeds the suggestion lists from benchmarks.suggestions' prose and drill
+streams into a plain-Python stand-in for the tape's text storage. The incremental path
+runs RenderedList.diff and update as showSuggestions_ does, keeping the
+unchanged leading entries; the full path clears the storage and renders
+every entry, as before user-034. Besides time, it counts the characters
+written to the storage, which is what the text system has to lay out
+again.
+"""
+
+from random import Random
+
+from plover_mac_ui.steno import STROKE_DELIMITER
+from plover_mac_ui.suggestions_model import (
+  RenderedList, SuggestionCache, suggestions_for_last_words,
+)
+
+from benchmarks.suggestions import (
+  MINUTES, VOCABULARY, WPM, FakeEngine, Suggestions, drill_stream, make_dictionaries,
+  word_stream,
+)
+from benchmarks.timing import header, measure, report
+
+class FakeStorage:
+  def __init__(self):
+    self.text = ""
+    self.written = 0
+
+  def truncate(self, offset):
+    self.text = self.text[:offset]
+
+  def append(self, fragment):
+    self.text += fragment
+    self.written += len(fragment)
+
+def fragment(sug):
+  lines = [sug.text]
+  lines.extend("  " + STROKE_DELIMITER.join(steno) for steno in sug.steno_list)
+  return "\n".join(lines) + "\n"
+
+def incremental(storage, rendered, suggestion_list):
+  keep, offset, added = rendered.diff(suggestion_list)
+  fragments = [fragment(sug) for sug in added]
+  storage.truncate(offset)
+  for f in fragments:
+    storage.append(f)
+  rendered.update(keep, added, [len(f) for f in fragments])
+
+def full(storage, suggestion_list):
+  storage.truncate(0)
+  for sug in suggestion_list:
+    storage.append(fragment(sug))
+
+def suggestion_lists(stream):
+  rng = Random(250)
+  words = [f"word{i}" for i in range(VOCABULARY)]
+  dictionaries = make_dictionaries(rng, words)
+  engine = FakeEngine(dictionaries)
+  cache = SuggestionCache(lambda phrase: Suggestions(dictionaries).find(phrase))
+  lists = []
+  for word in stream(rng, words, WPM * MINUTES):
+    engine.translate(word)
+    lists.append(suggestions_for_last_words(engine, cache))
+  return lists
+
+def replay(label, update, lists):
+  storage = FakeStorage()
+  step = iter(lists)
+  times = measure(lambda: update(storage, next(step)), len(lists))
+  report(label, times)
+  return storage.written
+
+def main():
+  for name, stream in [("prose", word_stream), ("drill", drill_stream)]:
+    lists = suggestion_lists(stream)
+    header(f"{name}: redraw the tape for {len(lists)} suggestion lists")
+    rendered = RenderedList()
+    incremental_chars = replay("RenderedList diff (incremental)",
+      lambda storage, sl: incremental(storage, rendered, sl), lists)
+    full_chars = replay("clear and render all (before)", full, lists)
+    print(f"characters written: incremental {incremental_chars}, full {full_chars}")
+
+if __name__ == "__main__":
+  main()
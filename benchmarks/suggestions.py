@@ -0,0 +1,111 @@
+"""Per-word suggestions latency over a synthetic 250 WPM stream.
+
+Replays five minutes of writing at 250 WPM (one word every 240 ms) through
+suggestions_model.suggestions_for_last_words, the work the suggestions
+tool does on the hook worker for each translated word, and through the
+lookup loop it replaced. Suggestions come from plover's own Suggestions
+class over a real dictionary collection, standing in for
+engine.get_suggestions.
+
+Two streams are replayed: prose drawn from a skewed word distribution,
+where almost every ten-word tail is new, and a drill repeating one
+sentence, where the phrase cache is warm.
+"""
+
+from collections import namedtuple
+from random import Random
+from threading import RLock
+
+from plover.formatting import RetroFormatter, _Action
+from plover.steno_dictionary import StenoDictionary, StenoDictionaryCollection
+from plover.suggestions import Suggestions
+
+from plover_mac_ui.steno import dictionaries_stamp
+from plover_mac_ui.suggestions_model import (
+  WORD_COUNT, WORD_RX, SuggestionCache, suggestions_for_last_words,
+)
+
+from benchmarks.timing import header, measure, report
+
+WPM = 250
+MINUTES = 5
+VOCABULARY = 5000
+PHRASES = 2000
+UNDO_LEVELS = 100
+
+Translation = namedtuple("Translation", "formatting")
+TranslatorState = namedtuple("TranslatorState", "translations")
+
+class FakeEngine:
+  def __init__(self, dictionaries):
+    self.dictionaries = dictionaries
+    self.translator_state = TranslatorState([])
+    self._lock = RLock()
+
+  def __enter__(self):
+    self._lock.acquire()
+    return self
+
+  def __exit__(self, *exc):
+    self._lock.release()
+
+  def get_suggestions(self, translation):
+    return Suggestions(self.dictionaries).find(translation)
+
+  def translate(self, text):
+    with self:
+      translations = self.translator_state.translations
+      translations.append(Translation([_Action(text=text)]))
+      del translations[:-UNDO_LEVELS]
+
+def make_dictionaries(rng, words):
+  d = StenoDictionary()
+  d.path = "main.json"
+  d.update(((f"W{i}",), word) for i, word in enumerate(words))
+  for i in range(PHRASES):
+    phrase = " ".join(rng.choices(words[:500], k=rng.randint(2, 3)))
+    d[(f"P{i}",)] = phrase
+  return StenoDictionaryCollection([d])
+
+def word_stream(rng, words, count):
+  weights = [1 / (rank + 1) for rank in range(len(words))]
+  return rng.choices(words, weights=weights, k=count)
+
+# SuggestionsToolController.didTranslateFrom_to_ before user-031.
+def uncached(engine):
+  with engine:
+    words = RetroFormatter(engine.translator_state.translations).last_words(
+      WORD_COUNT, rx=WORD_RX)
+  suggestion_list = []
+  for i in range(len(words)):
+    suggestion_list.extend(engine.get_suggestions("".join(words[i:])))
+  return suggestion_list
+
+def drill_stream(rng, words, count):
+  sentence = rng.choices(words[:200], k=12)
+  return (sentence * (count // len(sentence) + 1))[:count]
+
+def run(label, pipeline, dictionaries, stream):
+  engine = FakeEngine(dictionaries)
+  step = iter(stream)
+  times = measure(lambda: (engine.translate(next(step)), pipeline(engine)), len(stream))
+  report(label, times)
+
+def main():
+  rng = Random(250)
+  words = [f"word{i}" for i in range(VOCABULARY)]
+  dictionaries = make_dictionaries(rng, words)
+  for name, stream in [
+    ("prose", word_stream(rng, words, WPM * MINUTES)),
+    ("drill", drill_stream(rng, words, WPM * MINUTES)),
+  ]:
+    cache = SuggestionCache(lambda phrase: Suggestions(dictionaries).find(phrase),
+      stamp=lambda: dictionaries_stamp(dictionaries.dicts))
+    header(f"{name}: {len(stream)} words at {WPM} WPM, "
+      f"budget {60000 / WPM:.0f} ms per word")
+    run("suggestions_for_last_words (cached)",
+      lambda engine: suggestions_for_last_words(engine, cache), dictionaries, stream)
+    run("lookup every suffix (before)", uncached, dictionaries, stream)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,29 @@
+"""Timing helpers shared by the headless benchmarks.
+
+Benchmarks import plover and plover_mac_ui but never AppKit, so they run
+on Linux. Run one from the repository root, e.g.
+
+  python -m benchmarks.keymap_index
+"""
+
+from time import perf_counter
+
+def measure(fn, repeat):
+  times = []
+  for _ in range(repeat):
+    start = perf_counter()
+    fn()
+    times.append(perf_counter() - start)
+  return times
+
+def report(label, times):
+  times = sorted(times)
+  mean = sum(times) / len(times)
+  p50 = times[len(times) // 2]
+  p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+  print(f"{label:<44} {len(times):>7} {mean * 1e3:>9.4f} {p50 * 1e3:>9.4f} "
+    f"{p95 * 1e3:>9.4f} {times[-1] * 1e3:>9.4f}")
+
+def header(title):
+  print(title)
+  print(f"{'':<44} {'runs':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
@@ -22,11 +22,12 @@ import os
 
 import plover
 from plover import system
-from plover.config import DictionaryConfig
-from plover.registry import Plugin, registry
+from plover.registry import registry
+from plover_mac_ui import latency, startup
+from plover_mac_ui.async_utils import do_async
+from plover_mac_ui.dictionary_toggle import toggle_dictionary
 from plover_mac_ui.fonts import DEFAULT_FONT
-from plover_mac_ui.lookup_model import Dictionary
-from plover_mac_ui.preferences import PreferencesController
+from plover_mac_ui.lookup_model import Dictionary, dictionary_for, log_warm_up_progress
 from plover_mac_ui.resources import icon_named, nib_named, plover_logo
 from plover_mac_ui.systems import (
   MACHINE_NAMES, machine_plugin, pretty_machine_name, machine_icon,
@@ -34,6 +35,8 @@ from plover_mac_ui.systems import (
 )
 
 SOFTWARE_NAME = plover.__name__.capitalize()
+# Matches PreferencesController.actionText, without importing preferences.
+PREFERENCES_TITLE = "Preferences..."
 
 
 def make_item(title="", action="", key="", icon=None, obj=None, enabled=True, selected=None, indent=0):
@@ -55,7 +58,7 @@ NSApplicationDelegate = protocolNamed("NSApplicationDelegate")
 
 class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
   tools = ivar()
-  prefs = ivar()
+  _prefs = ivar()
 
   def initWithEngine_(self, engine):
     self = super(AppDelegate, self).init()
@@ -64,15 +67,31 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
     self.engine = engine
     engine.cocoa_app = self
     engine.hook_connect("quit", self.quit)
-
-    self.tools = {
-      plugin.name: plugin.obj.alloc().initWithEngine_(engine)
-      for plugin in registry.list_plugins("gui.mac.tool")
-      if plugin.obj.enabled
-    }
-    self.prefs = PreferencesController.alloc().initWithEngine_(engine)
+    engine.hook_connect("dictionaries_loaded", self.dictionariesDidLoad_)
+
+    self.pluginItems = {"machine": {}, "system": {}}
+    self.checkedItems = {}
+    self.statusIconName = None
+    self.machineType = None
+    self.useMachineIcon = "PLOVER_MACHINE_ICON" in os.environ
+
+    self.tools = {}
+    for plugin in registry.list_plugins("gui.mac.tool"):
+      if not plugin.obj.enabled:
+        continue
+      for hook in plugin.obj.showOnHooks:
+        engine.hook_connect(hook,
+          (lambda name: lambda *args: self.asyncShowTool_(name))(plugin.name))
     return self
 
+  @property
+  def prefs(self):
+    if self._prefs is None:
+      # Deferred: preferences pulls in pyserial and the keymap editor.
+      from plover_mac_ui.preferences import PreferencesController
+      self._prefs = PreferencesController.alloc().initWithEngine_(self.engine)
+    return self._prefs
+
   def applicationDidFinishLaunching_(self, _):
     main_menu_nib = nib_named("MainMenu")
     ok, objects = main_menu_nib.instantiateWithOwner_topLevelObjects_(None, None)
@@ -97,32 +116,40 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
     system_name = (lambda x: x) \
       if "PLOVER_FULL_NAMES" in os.environ else pretty_system_name
 
+    def register_item(plugin_type, name, item):
+      self.pluginItems[plugin_type][name] = item
+      return item
+
     def make_machine_item(mach):
       if "PLOVER_ALL_PLUGINS" in os.environ:
-        return make_item(machine_name(mach.name), "changeMachine:",
-          # icon=icon_named(f"{machine_name(mach.name)-enabled"),
-          obj=mach, indent=1)
+        return register_item("machine", mach.name,
+          make_item(machine_name(mach.name), "changeMachine:",
+            # icon=icon_named(f"{machine_name(mach.name)-enabled"),
+            obj=mach, indent=1))
       else:
         plugin = registry.get_plugin("machine", mach)
-        return make_item(machine_name(mach), "changeMachine:",
-          # icon=icon_named(f"{machine_icon(mach)}-enabled"),
-          obj=plugin, indent=1, enabled=plugin is not None)
+        return register_item("machine", mach,
+          make_item(machine_name(mach), "changeMachine:",
+            # icon=icon_named(f"{machine_icon(mach)}-enabled"),
+            obj=plugin, indent=1, enabled=plugin is not None))
 
     def make_system_item(sys):
       if "PLOVER_ALL_PLUGINS" in os.environ:
-        return make_item(system_name(sys.name), "changeSystem:",
-          # icon=icon_named(system_icon(sys.name), template=False),
-          obj=sys, indent=1)
+        return register_item("system", sys.name,
+          make_item(system_name(sys.name), "changeSystem:",
+            # icon=icon_named(system_icon(sys.name), template=False),
+            obj=sys, indent=1))
       else:
         plugin = registry.get_plugin("system", sys)
-        return make_item(system_name(sys), "changeSystem:",
-          # icon=icon_named(system_icon(sys), template=False),
-          obj=plugin, indent=1, enabled=plugin is not None)
+        return register_item("system", sys,
+          make_item(system_name(sys), "changeSystem:",
+            # icon=icon_named(system_icon(sys), template=False),
+            obj=plugin, indent=1, enabled=plugin is not None))
 
     def make_tool_item(tool):
       return make_item(
         tool.obj.actionText or None, "openTool:", tool.obj.shortcut or None,
-        obj=self.tools.get(tool.name),
+        obj=tool.name,
         enabled=tool.obj.enabled)
 
     self.outputMenuItem = make_empty_item()
@@ -165,7 +192,7 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
       *map(make_tool_item, registry.list_plugins("gui.mac.tool")),
 
       NSMenuItem.separatorItem(),
-      make_item(self.prefs.actionText, "openPreferences", ","),
+      make_item(PREFERENCES_TITLE, "openPreferences", ","),
 
       NSMenuItem.separatorItem(),
       make_item(f"About {SOFTWARE_NAME}", "openAboutWindow"),
@@ -182,10 +209,13 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
     self.engine.hook_connect("config_changed", self.configDidChange_)
     self.engine.hook_connect("configure", self.openPreferences)
 
+    self.machineType = self.engine.config["machine_type"]
     self.outputDidChange_(self.engine.output)
-    self.machine_stateDidChange_(self.engine.config["machine_type"], self.engine.machine_state)
+    self.machine_stateDidChange_(self.machineType, self.engine.machine_state)
     self.configDidChange_(self.engine.config)
     self.emulationDidChange_(self.engine.improved_keyboard_emulation)
+    startup.mark("status item ready")
+    startup.log_report()
 
   def toggleOutput(self):
     with self.engine:
@@ -207,12 +237,24 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
     with self.engine:
       self.engine._update({"machine_type": selection.representedObject().name})
 
+  def toolNamed_(self, name):
+    if name not in self.tools:
+      plugin = registry.get_plugin("gui.mac.tool", name)
+      self.tools[name] = plugin.obj.alloc().initWithEngine_(self.engine)
+    return self.tools[name]
+
+  def showTool_(self, name):
+    self.toolNamed_(name).showWindow_(self)
+
+  def asyncShowTool_(self, name):
+    do_async(self.showTool_, name)
+
   def openTool_(self, sender):
     if sender.representedObject():
-      sender.representedObject().asyncShowWindow()
+      self.showTool_(sender.representedObject())
 
   def openPreferences(self):
-    self.prefs.asyncShowWindow()
+    do_async(lambda: self.prefs.showWindow_(self))
 
   def openAboutWindow(self):
     about_text = (
@@ -229,12 +271,17 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
     })
 
   def iconName(self):
-    machine_type = machine_icon(self.engine.config["machine_type"]) \
-      if "PLOVER_MACHINE_ICON" in os.environ else "state"
+    machine_type = machine_icon(self.machineType) if self.useMachineIcon else "state"
     state = "disconnected" if self.engine._machine_state != "connected" else \
       "enabled" if self.engine.output else "disabled"
     return f"{machine_type}-{state}"
 
+  def updateStatusIcon(self):
+    name = self.iconName()
+    if name != self.statusIconName:
+      self.statusIconName = name
+      self.statusItem.button().setImage_(icon_named(name))
+
   def statusLabel(self):
     label_type = os.environ.get("PLOVER_STATUS_LABEL")
     if label_type == "short":
@@ -245,29 +292,29 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
 
   def outputDidChange_(self, enabled):
     self.outputMenuItem.setTitle_(f"Output: {'On' if enabled else 'Off'}")
-    self.statusItem.button().setImage_(icon_named(self.iconName()))
+    self.updateStatusIcon()
     self.toggleOutputMenuItem.setTitle_(f"{'Disable' if enabled else 'Enable'} Output")
 
-  def clearSelections_(self, plugin_type):
-    for item in self.menu.itemArray():
-      if (isinstance(item.representedObject(), Plugin) and
-          item.representedObject().plugin_type == plugin_type):
-        item.setState_(NSOffState)
+  def checkPlugin_ofType_(self, name, plugin_type):
+    item = self.pluginItems[plugin_type].get(name)
+    checked = self.checkedItems.get(plugin_type)
+    if item is checked:
+      return
+    if checked is not None:
+      checked.setState_(NSOffState)
+    if item is not None:
+      item.setState_(NSOnState)
+    self.checkedItems[plugin_type] = item
 
   def machine_stateDidChange_(self, machine_type, state):
-    self.clearSelections_("machine")
-    self.menu.itemAtIndex_(
-      self.menu.indexOfItemWithRepresentedObject_(
-        registry.get_plugin("machine", machine_type))).setState_(NSOnState)
+    self.machineType = machine_type
+    self.checkPlugin_ofType_(machine_type, "machine")
     self.machineStateMenuItem.setTitle_(
       f"{pretty_machine_name(machine_type)}: {state.capitalize()}")
-    self.statusItem.button().setImage_(icon_named(self.iconName()))
+    self.updateStatusIcon()
 
   def configDidChange_(self, config):
-    self.clearSelections_("system")
-    self.menu.itemAtIndex_(
-      self.menu.indexOfItemWithRepresentedObject_(
-        registry.get_plugin("system", system.NAME))).setState_(NSOnState)
+    self.checkPlugin_ofType_(system.NAME, "system")
     self.systemNameMenuItem.setTitle_(
       f"System: {pretty_system_name(system.NAME)}")
     
@@ -277,31 +324,39 @@ class AppDelegate(NSObject, protocols=[NSApplicationDelegate]):
 
     if "dictionaries" in config:
       self.dictMenu.removeAllItems()
-      for d in config["dictionaries"]:
+      for i, d in enumerate(config["dictionaries"]):
         item = make_item(
           Dictionary.short_dict_name(d), "toggleDictionary:",
           obj=d, selected=d.enabled)
+        item.setTag_(i)
         self.dictMenu.addItem_(item)
 
+  def dictionariesDidLoad_(self, dictionaries):
+    dictionary_for(dictionaries, lock=self.engine).warm_up_async(progress=log_warm_up_progress)
+
   def toggleDictionary_(self, selection):
-    obj = selection.representedObject()
-    dict_index = self.dictMenu.indexOfItemWithRepresentedObject_(obj)
-    config = self.engine.config["dictionaries"]
-    enabled = not config[dict_index].enabled
-    config[dict_index] = DictionaryConfig(obj.path, enabled=enabled)
-    with self.engine:
-      self.engine._update({"dictionaries": config})
-    self.dictMenu.itemAtIndex_(dict_index).setState_(NSOnState if enabled else NSOffState)
+    enabled = toggle_dictionary(self.engine, selection.tag())
+    selection.setState_(NSOnState if enabled else NSOffState)
 
   def emulationDidChange_(self, emulation):
     self.emulationMenuItem.setTitle_(
       f"Emulation: {'Improved' if self.engine.improved_keyboard_emulation else 'Stock'}")
 
   def openPaperTape(self):
-    self.tools["tool2_paper_tape"].asyncShowWindow()
+    self.asyncShowTool_("tool2_paper_tape")
 
   def openLayoutDisplay(self):
-    self.tools["tool3_layout_display"].asyncShowWindow()
+    self.asyncShowTool_("tool3_layout_display")
+
+  def commitPendingEdits(self):
+    if self._prefs is not None:
+      self._prefs.commitKeymapEdit()
+
+  def applicationWillTerminate_(self, notification):
+    self.commitPendingEdits()
 
   def quit(self):
+    self.commitPendingEdits()
+    if latency.enabled:
+      latency.stats.dump(latency.report_path)
     NSApplication.sharedApplication().terminate_(self)
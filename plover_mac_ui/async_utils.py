@@ -1,7 +1,9 @@
 from libdispatch import dispatch_async, dispatch_get_main_queue
 
-def do_async(fn, *args):
-  dispatch_async(
-    dispatch_get_main_queue(),
-    lambda: [fn(*args), None][-1],
-  )
+from plover_mac_ui.dispatcher import CoalescingDispatcher
+
+main_dispatcher = CoalescingDispatcher(
+  lambda block: dispatch_async(dispatch_get_main_queue(), block))
+
+def do_async(fn, *args, key=None):
+  main_dispatcher.submit(fn, *args, key=key)
@@ -0,0 +1,29 @@
+from plover.config import DictionaryConfig
+from plover.steno_dictionary import StenoDictionaryCollection
+
+def toggle_dictionary(engine, index):
+  """Flips enabled for the index-th configured dictionary and returns it.
+
+  A loaded dictionary is flipped in place and the flag persisted, instead
+  of pushing the whole list through engine._update and reloading
+  everything. Dictionaries that are not loaded still go through _update."""
+  with engine:
+    config = engine.config["dictionaries"]
+    path = config[index].path
+    enabled = not config[index].enabled
+    config[index] = DictionaryConfig(path, enabled=enabled)
+
+    loaded = [d for d in engine.dictionaries.dicts if d.path == path]
+    if not loaded:
+      engine._update({"dictionaries": config})
+      return enabled
+    loaded[0].enabled = enabled
+    engine._config.update(dictionaries=config)
+    engine._config.save()
+    # config_changed is skipped on purpose: the caller updates the one menu
+    # item itself, and its listeners would rebuild the whole Dictionaries
+    # menu. Like the engine, listeners get a new collection rather than the
+    # engine's own.
+    engine._trigger_hook("dictionaries_loaded",
+      StenoDictionaryCollection(engine.dictionaries.dicts))
+  return enabled
@@ -0,0 +1,45 @@
+from collections import OrderedDict
+from itertools import count
+from threading import Lock
+from time import perf_counter
+
+from plover import log
+from plover_mac_ui import latency
+
+class CoalescingDispatcher:
+  def __init__(self, dispatch):
+    self._dispatch = dispatch
+    self._lock = Lock()
+    self._pending = OrderedDict()
+    self._ids = count()
+    self._scheduled = False
+
+  def submit(self, fn, *args, key=None):
+    with self._lock:
+      if key is None:
+        key = next(self._ids)
+      else:
+        self._pending.pop(key, None)
+      trace = latency.current_trace() if latency.enabled else None
+      self._pending[key] = (fn, args, trace, perf_counter() if trace else None)
+      if self._scheduled:
+        return
+      self._scheduled = True
+    self._dispatch(self.drain)
+
+  def drain(self):
+    with self._lock:
+      pending, self._pending = self._pending, OrderedDict()
+      self._scheduled = False
+    for fn, args, trace, enqueued in pending.values():
+      started = perf_counter() if trace else None
+      try:
+        fn(*args)
+      except Exception:
+        log.error("main queue callback %r failed", fn, exc_info=True)
+      if trace:
+        source, hook_started = trace
+        finished = perf_counter()
+        latency.stats.record(source, "main_wait", started - enqueued)
+        latency.stats.record(source, "main_run", finished - started)
+        latency.stats.record(source, "total", finished - hook_started)
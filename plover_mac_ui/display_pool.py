@@ -0,0 +1,30 @@
+# Keeps one display controller per machine type. Only the active controller
+# stays connected to the engine's config_changed hook.
+class DisplayControllerPool:
+  def __init__(self, engine, controller_class_for):
+    self.engine = engine
+    self.controller_class_for = controller_class_for
+    self.controllers = {}
+    self.active = None
+
+  # Raises KeyError, via controller_class_for, for machines without a layout.
+  def controller_for(self, machine):
+    cls = self.controller_class_for(machine)
+    controller = self.controllers.get(cls)
+    if controller is None:
+      controller = cls.alloc().initWithEngine_(self.engine)
+      self.controllers[cls] = controller
+    if controller is not self.active:
+      if self.active is not None:
+        self.active.deactivate()
+      controller.activate()
+      self.active = controller
+    return controller
+
+  def suspend(self):
+    if self.active is not None:
+      self.active.deactivate()
+
+  def resume(self):
+    if self.active is not None:
+      self.active.activate()
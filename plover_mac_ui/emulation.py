@@ -0,0 +1,119 @@
+from collections import namedtuple
+from enum import Enum
+from math import isfinite
+from time import perf_counter, sleep
+import os
+
+from plover import log
+
+from plover_mac_ui import latency
+
+RETURN_KEYCODE = 36
+CHUNK_SIZE = 20
+
+class EventKind(Enum):
+  TEXT = 0
+  RETURN = 1
+
+Event = namedtuple("Event", "kind text")
+RETURN = Event(EventKind.RETURN, "\n")
+
+def chunk_sizes(min_size, max_size):
+  size = min_size
+  while True:
+    yield size
+    size = min(size * 2, max_size)
+
+def check_chunk_size(size):
+  if size < 1:
+    raise ValueError(f"chunk size must be positive, not {size}")
+
+# Yields the text chunks of s, and "\n" for each Return. Chunks never
+# contain a newline, so "\n" is unambiguous.
+def plan_chunks(s, chunk_size=CHUNK_SIZE, max_chunk_size=None):
+  # Checked here rather than in the generator so a bad size fails at the call.
+  check_chunk_size(chunk_size)
+  return _plan_chunks(s, chunk_size, max(chunk_size, max_chunk_size or chunk_size))
+
+def _plan_chunks(s, chunk_size, max_chunk_size):
+  # Fixed-size chunks, the default, skip the size generator.
+  sizes = None if chunk_size == max_chunk_size else chunk_sizes(chunk_size, max_chunk_size)
+  start, end = 0, len(s)
+  while start < end:
+    line_end = s.find("\n", start)
+    if line_end == -1:
+      line_end = end
+    if sizes is None:
+      for i in range(start, line_end, chunk_size):
+        yield s[i:min(i + chunk_size, line_end)]
+    else:
+      while start < line_end:
+        chunk_end = min(start + next(sizes), line_end)
+        yield s[start:chunk_end]
+        start = chunk_end
+    if line_end < end:
+      yield "\n"
+    start = line_end + 1
+
+def plan_string(s, chunk_size=CHUNK_SIZE, max_chunk_size=None):
+  return (RETURN if chunk == "\n" else Event(EventKind.TEXT, chunk)
+    for chunk in plan_chunks(s, chunk_size, max_chunk_size))
+
+class ChunkedSender:
+  def __init__(self, send_text, send_return,
+      min_size=CHUNK_SIZE, max_size=None, delay=0.0,
+      sleep=sleep, clock=perf_counter):
+    check_chunk_size(min_size)
+    self.send_text = send_text
+    self.send_return = send_return
+    self.min_size = min_size
+    # Chunks only grow past min_size when max_size is set explicitly.
+    self.max_size = max_size or min_size
+    self.delay = delay
+    self._sleep = sleep
+    self._clock = clock
+    self.events = 0
+    self.characters = 0
+    self.elapsed = 0.0
+
+  def send(self, s):
+    started = self._clock()
+    characters = self.characters
+    for i, chunk in enumerate(plan_chunks(s, self.min_size, self.max_size)):
+      if i and self.delay:
+        self._sleep(self.delay)
+      if chunk == "\n":
+        self.send_return()
+      else:
+        self.send_text(chunk)
+      self.events += 1
+      self.characters += len(chunk)
+    elapsed = self._clock() - started
+    self.elapsed += elapsed
+    if latency.enabled:
+      latency.stats.record("KeyboardEmulation", "send", elapsed)
+      latency.stats.increment("KeyboardEmulation", "chars", self.characters - characters)
+
+def _setting_from_env(environ, name, parse, default, valid):
+  value = environ.get(name)
+  if value is None:
+    return default
+  try:
+    setting = parse(value)
+  except ValueError:
+    setting = None
+  if setting is None or not valid(setting):
+    log.warning("ignoring invalid %s %r", name, value)
+    return default
+  return setting
+
+# Keyword arguments for ChunkedSender from PLOVER_EMULATION_MIN_CHUNK,
+# PLOVER_EMULATION_MAX_CHUNK and PLOVER_EMULATION_DELAY.
+def sender_options_from_env(environ=os.environ, min_size=CHUNK_SIZE):
+  min_size = _setting_from_env(environ, "PLOVER_EMULATION_MIN_CHUNK",
+    int, min_size, lambda size: size >= 1)
+  max_size = _setting_from_env(environ, "PLOVER_EMULATION_MAX_CHUNK",
+    int, min_size, lambda size: size >= min_size)
+  delay = _setting_from_env(environ, "PLOVER_EMULATION_DELAY",
+    float, 0.0, lambda delay: isfinite(delay) and delay >= 0)
+  return {"min_size": min_size, "max_size": max_size, "delay": delay}
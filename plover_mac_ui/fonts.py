@@ -1,5 +1,9 @@
+from functools import lru_cache
+
 from AppKit import NSFont
 
+from plover_mac_ui.scripts import is_korean, is_zh_ja
+
 DEFAULT_FONT = NSFont.systemFontOfSize_(NSFont.systemFontSize())
 
 STENO_FONT = "JetBrainsMono"  # "CartographCF"
@@ -15,41 +19,33 @@ SUGGESTIONS_SIZE = 14
 SUGGESTIONS_STENO_SIZE = 13
 LOOKUP_LIST_SIZE = 14
 
-def is_korean(text):
-  return any(ord(c) in range(0x3130, 0x3190) for c in text)
-
-def is_zh_ja(text):
-  return any(ord(c) > 0x3000 for c in text) and not is_korean(text)
-
+@lru_cache(maxsize=4096)
 def steno_font(text):
   return KOREAN_STENO_FONT if is_korean(text) else \
     ZH_JA_STENO_FONT if is_zh_ja(text) else STENO_FONT
 
+@lru_cache(maxsize=None)
+def font_named(family, weight, size):
+  return NSFont.fontWithName_size_(f"{family}-{weight}", size)
+
 def paper_tape_font(text):
-  return NSFont.fontWithName_size_(f"{steno_font(text)}-Regular",
-    PAPER_TAPE_SIZE)
+  return font_named(steno_font(text), "Regular", PAPER_TAPE_SIZE)
 
 def suggestions_steno_font(text):
-  return NSFont.fontWithName_size_(f"{steno_font(text)}-Regular",
-    SUGGESTIONS_STENO_SIZE)
+  return font_named(steno_font(text), "Regular", SUGGESTIONS_STENO_SIZE)
 
 def lookup_steno_font(text):
-  return NSFont.fontWithName_size_(f"{steno_font(text)}-Regular",
-    LOOKUP_STENO_SIZE)
+  return font_named(steno_font(text), "Regular", LOOKUP_STENO_SIZE)
 
 def key_name_font(text):
-  return NSFont.fontWithName_size_(f"{steno_font(text)}-Regular", KEY_NAME_SIZE)
+  return font_named(steno_font(text), "Regular", KEY_NAME_SIZE)
 
 def key_list_font(text):
-  light_font = NSFont.fontWithName_size_(
-    f"{steno_font(text)}-Light", KEY_LIST_SIZE)
-  if not light_font:
-    return NSFont.fontWithName_size_(
-      f"{steno_font(text)}-Regular", KEY_LIST_SIZE)
-  return light_font
+  return font_named(steno_font(text), "Light", KEY_LIST_SIZE) or \
+    font_named(steno_font(text), "Regular", KEY_LIST_SIZE)
 
 def key_list_bold_font(text):
-  return NSFont.fontWithName_size_(f"{steno_font(text)}-Bold", KEY_LIST_SIZE)
+  return font_named(steno_font(text), "Bold", KEY_LIST_SIZE)
 
 SUGGESTIONS_FONT = NSFont.boldSystemFontOfSize_(SUGGESTIONS_SIZE)
 LOOKUP_LIST_FONT = NSFont.boldSystemFontOfSize_(LOOKUP_LIST_SIZE)
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from itertools import count
+from threading import Condition, Lock, Thread
+from time import perf_counter
+
+from plover import log
+from plover_mac_ui import latency
+
+MAX_PENDING = 64
+
+class HookWorker(Thread):
+  def __init__(self, name="hooks", max_pending=MAX_PENDING):
+    super().__init__(name=f"mac-ui-{name}", daemon=True)
+    self.max_pending = max_pending
+    self.dropped = 0
+    self._pending = OrderedDict()
+    self._ids = count()
+    self._cond = Condition()
+    self._stopped = False
+
+  # Only keyed jobs can be superseded or evicted; unkeyed jobs, such as one
+  # paper tape stroke each, always run even if the queue grows past
+  # max_pending.
+  def submit(self, fn, *args, key=None):
+    with self._cond:
+      keyed = key is not None
+      if not keyed:
+        key = ("unkeyed", next(self._ids))
+      elif self._pending.pop(key, None) is not None:
+        self._drop()
+      self._pending[key] = (fn, args, keyed)
+      if len(self._pending) > self.max_pending:
+        self._evict()
+      self._cond.notify()
+
+  def _evict(self):
+    for key, (_, _, keyed) in self._pending.items():
+      if keyed:
+        del self._pending[key]
+        self._drop()
+        return
+
+  def _drop(self):
+    self.dropped += 1
+    if latency.enabled:
+      latency.stats.increment("HookWorker", "dropped")
+
+  def stop(self):
+    with self._cond:
+      self._stopped = True
+      self._pending.clear()
+      self._cond.notify()
+
+  def run(self):
+    while True:
+      with self._cond:
+        while not self._pending and not self._stopped:
+          self._cond.wait()
+        if self._stopped:
+          return
+        _, (fn, args, _) = self._pending.popitem(last=False)
+      try:
+        fn(*args)
+      except Exception:
+        log.error("hook handler %r failed", fn, exc_info=True)
+
+_worker = None
+_worker_lock = Lock()
+
+def hook_worker():
+  global _worker
+  with _worker_lock:
+    if _worker is None:
+      _worker = HookWorker()
+      _worker.start()
+    return _worker
+
+def _run_traced(source, started, fn, *args):
+  latency.stats.record(source, "worker", perf_counter() - started)
+  with latency.tracing(source, started):
+    fn(*args)
+
+def offloaded(fn, key=None, source=None):
+  def _offloaded(*args):
+    if source and latency.enabled:
+      hook_worker().submit(_run_traced, source, perf_counter(), fn, *args, key=key)
+    else:
+      hook_worker().submit(fn, *args, key=key)
+  return _offloaded
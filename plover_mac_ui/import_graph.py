@@ -0,0 +1,102 @@
+"""Static import graph of plover_mac_ui.
+
+Parses the package sources instead of importing them, so it runs without
+AppKit or PyObjC:
+
+  python -m plover_mac_ui.import_graph [module ...]
+
+prints every module loaded eagerly by the given modules (by default the
+GUI entry point and the tool plugins the registry loads at startup),
+followed by the imports that are deferred into functions.
+"""
+
+import ast
+import os
+import sys
+
+PACKAGE = "plover_mac_ui"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STARTUP_MODULES = (
+  "main",
+  "app_delegate",
+  "commands",
+  "layout_display",
+  "lookup",
+  "paper_tape",
+)
+
+def _imported_names(node):
+  if isinstance(node, ast.Import):
+    return [alias.name for alias in node.names]
+  if node.level:
+    return []
+  if node.module == PACKAGE:
+    return [f"{PACKAGE}.{alias.name}" for alias in node.names]
+  return [node.module]
+
+def module_imports(source):
+  """Returns (eager, deferred) sets of module names imported by source.
+
+  Imports in function bodies are deferred; everything else, including
+  imports inside module-level with, try and if blocks, is eager."""
+  eager, deferred = set(), set()
+
+  def visit(node, in_function):
+    for child in ast.iter_child_nodes(node):
+      if isinstance(child, (ast.Import, ast.ImportFrom)):
+        (deferred if in_function else eager).update(_imported_names(child))
+      visit(child, in_function or isinstance(
+        child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)))
+
+  visit(ast.parse(source), False)
+  return eager, deferred
+
+def package_graph(package_dir=PACKAGE_DIR):
+  graph = {}
+  for filename in sorted(os.listdir(package_dir)):
+    if not filename.endswith(".py"):
+      continue
+    with open(os.path.join(package_dir, filename), encoding="utf-8") as f:
+      graph[filename[:-3]] = module_imports(f.read())
+  return graph
+
+def local_name(module):
+  prefix = f"{PACKAGE}."
+  return module[len(prefix):] if module.startswith(prefix) else None
+
+def eager_closure(graph, roots):
+  """Returns (local, external): package modules loaded eagerly from roots,
+  and the external modules they import."""
+  seen, external = set(), set()
+  pending = list(roots)
+  while pending:
+    module = pending.pop()
+    if module in seen or module not in graph:
+      continue
+    seen.add(module)
+    for name in graph[module][0]:
+      local = local_name(name)
+      if local is None:
+        external.add(name)
+      elif local not in seen:
+        pending.append(local)
+  return seen, external
+
+def main(argv=None):
+  roots = (argv if argv is not None else sys.argv[1:]) or STARTUP_MODULES
+  graph = package_graph()
+  local, external = eager_closure(graph, roots)
+  print(f"{len(local)} package modules loaded eagerly from {', '.join(roots)}:")
+  for module in sorted(local):
+    print(f"  {module}")
+  print("external modules:")
+  for module in sorted(external):
+    print(f"  {module}")
+  print("deferred imports:")
+  for module in sorted(local):
+    for name in sorted(graph[module][1]):
+      print(f"  {module} -> {name}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,48 @@
+from time import perf_counter
+
+from plover import log
+from plover.machine.keymap import Keymap
+
+from plover_mac_ui import latency
+
+# Seconds without further edits before staged changes are pushed to the engine.
+COMMIT_DELAY = 1.0
+
+def copy_keymap(keymap):
+  copy = Keymap(keymap.get_keys(), keymap.get_actions())
+  copy.set_bindings(keymap.get_bindings())
+  return copy
+
+class KeymapEdit:
+  """Stages key bindings so a run of edits reaches the engine as one update."""
+
+  def __init__(self, base):
+    self.base = base
+    self.bindings = dict(base.get_bindings())
+    self.changes = {}
+    self.keymap = copy_keymap(base)
+
+  @property
+  def pending(self):
+    return bool(self.changes)
+
+  def set_action(self, key, action):
+    if self.base.get_action(key) == action:
+      self.changes.pop(key, None)
+    else:
+      self.changes[key] = action
+    self.bindings[key] = action
+    self.keymap.set_bindings(self.bindings)
+
+  def commit(self, engine):
+    if not self.changes:
+      return False
+    start = perf_counter()
+    with engine:
+      engine._update({"system_keymap": self.keymap})
+    elapsed = perf_counter() - start
+    log.debug("committed %d keymap changes in %.1f ms", len(self.changes), elapsed * 1000)
+    if latency.enabled:
+      latency.stats.record("PreferencesController", "keymap", elapsed)
+    self.changes.clear()
+    return True
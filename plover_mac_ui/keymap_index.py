@@ -0,0 +1,22 @@
+NO_ACTIONS = {None, "no-op"}
+
+# Plain Python so it can be benchmarked without AppKit; the views are only
+# used as dictionary keys.
+def build_index(keymap, machine_keymap):
+  """Returns (key_actions, reverse_keymap) for a key -> view mapping.
+
+  Each key's action is looked up once, and keys are grouped by view in a
+  single walk over keymap."""
+  key_actions = {}
+  reverse_keymap = {}
+  for key, view in keymap.items():
+    key_actions[key] = machine_keymap.get_action(key)
+    reverse_keymap.setdefault(view, []).append(key)
+  return key_actions, reverse_keymap
+
+def view_state(actions):
+  """Returns (disabled, full_label) for a view bound to actions."""
+  labels = set(actions)
+  labels.discard(None)
+  disabled = all(action in NO_ACTIONS for action in actions)
+  return disabled, (list(labels)[0] if labels else "")
@@ -0,0 +1,120 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock, local
+from time import perf_counter
+import os
+
+from plover import log
+
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Set PLOVER_LATENCY_STATS to enable; a non-empty value is used as the
+# path the report is written to on quit.
+enabled = "PLOVER_LATENCY_STATS" in os.environ
+report_path = os.environ.get("PLOVER_LATENCY_STATS") or None
+
+_local = local()
+
+class Histogram:
+  def __init__(self, buckets=BUCKETS_MS):
+    self.buckets = buckets
+    self.counts = [0] * (len(buckets) + 1)
+    self.count = 0
+    self.total = 0.0
+    self.longest = 0.0
+
+  @property
+  def mean(self):
+    return self.total / self.count if self.count else 0.0
+
+  def record(self, ms):
+    index = len(self.buckets)
+    for i, edge in enumerate(self.buckets):
+      if ms <= edge:
+        index = i
+        break
+    self.counts[index] += 1
+    self.count += 1
+    self.total += ms
+    self.longest = max(self.longest, ms)
+
+  def percentile(self, fraction):
+    if not self.count:
+      return 0.0
+    target = fraction * self.count
+    seen = 0
+    for edge, bucket_count in zip(self.buckets, self.counts):
+      seen += bucket_count
+      if seen >= target:
+        return edge
+    return self.longest
+
+class LatencyStats:
+  def __init__(self):
+    self._lock = Lock()
+    self._histograms = defaultdict(Histogram)
+    self._counters = defaultdict(int)
+
+  def record(self, source, phase, seconds):
+    with self._lock:
+      self._histograms[(source, phase)].record(seconds * 1000)
+
+  def increment(self, source, name, amount=1):
+    with self._lock:
+      self._counters[(source, name)] += amount
+
+  def histogram(self, source, phase):
+    with self._lock:
+      return self._histograms.get((source, phase))
+
+  def counter(self, source, name):
+    with self._lock:
+      return self._counters.get((source, name), 0)
+
+  def clear(self):
+    with self._lock:
+      self._histograms.clear()
+      self._counters.clear()
+
+  def report(self):
+    with self._lock:
+      items = sorted(self._histograms.items())
+      counters = sorted(self._counters.items())
+    lines = [f"{'source':<28} {'phase':<10} {'count':>7} {'mean':>8} {'p50':>6} {'p95':>6} {'max':>8}"]
+    for (source, phase), hist in items:
+      lines.append(
+        f"{source:<28} {phase:<10} {hist.count:>7} {hist.mean:>8.2f} "
+        f"{hist.percentile(0.5):>6} {hist.percentile(0.95):>6} {hist.longest:>8.2f}")
+    for (source, name), value in counters:
+      lines.append(f"{source:<28} {name:<10} {value:>7}")
+    return "\n".join(lines)
+
+  def dump(self, path=None):
+    report = self.report()
+    if path:
+      with open(path, "w") as f:
+        f.write(report + "\n")
+    else:
+      log.info("UI latency (ms):\n%s", report)
+
+stats = LatencyStats()
+
+def current_trace():
+  return getattr(_local, "trace", None)
+
+@contextmanager
+def tracing(source, started=None):
+  previous = current_trace()
+  _local.trace = (source, started if started is not None else perf_counter())
+  try:
+    yield
+  finally:
+    _local.trace = previous
+
+def traced(fn, source):
+  if not enabled:
+    return fn
+  def _traced(*args):
+    with tracing(source):
+      return fn(*args)
+  return _traced
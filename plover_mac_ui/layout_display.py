@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from threading import Timer
 
 from AppKit import (
@@ -16,18 +17,22 @@ from objc import IBOutlet, ivar
 from plover import system
 from plover_mac_ui.async_utils import do_async
 from plover_mac_ui.fonts import (
-  is_korean,
   key_list_bold_font,
   key_list_font,
   to_halfwidth,
 )
+from plover_mac_ui.hook_worker import offloaded
 from plover_mac_ui.layout_display_views import *
 from plover_mac_ui.layout_display_controllers import *
-from plover_mac_ui.layout_model import display_controller_for, STROKE_TIMEOUT
+from plover_mac_ui.display_pool import DisplayControllerPool
+from plover_mac_ui.layout_model import STROKE_TIMEOUT, display_controller_for
 from plover_mac_ui.resources import BUNDLE
+from plover_mac_ui.scripts import Script, key_scripts
 from plover_mac_ui.steno_layout import remove_numbers
 from plover_mac_ui.tool import Tool
 
+LABEL_CACHE_SIZE = 256
+
 class LayoutDisplayController(Tool):
   actionText = "Layout Display"
   shortcut = "s"
@@ -44,7 +49,18 @@ class LayoutDisplayController(Tool):
     self.configDidChange_(self.engine.config)
 
   def completeInit(self):
-    self.engine.hook_connect("stroked", self.didStroke_)
+    self._key_fragments = None
+    self._labels = OrderedDict()
+    self._display_pool = DisplayControllerPool(self.engine, display_controller_for)
+    self.addWindowHook_handler_("stroked",
+      offloaded(self.didStroke_, key="layout_display",
+        source="LayoutDisplayController"))
+
+  def windowDidShow(self):
+    self._display_pool.resume()
+
+  def windowDidHide(self):
+    self._display_pool.suspend()
 
   def configDidChange_(self, config):
     if "machine_type" in config and self.display is not None:
@@ -61,10 +77,12 @@ class LayoutDisplayController(Tool):
       return
 
     try:
-      self.displayController = \
-        display_controller_for(machine).alloc().initWithEngine_(self.engine)
+      controller = self._display_pool.controller_for(machine)
     except KeyError:
       return
+    if controller is self.displayController:
+      return
+    self.displayController = controller
 
     for view in self.display.subviews():
       if view is not self.displayView:
@@ -87,23 +105,44 @@ class LayoutDisplayController(Tool):
     self.timer = Timer(STROKE_TIMEOUT, lambda: self.displayStroke_([]))
     self.timer.start()
 
+  def keyFragments(self):
+    keys = tuple(system.KEYS)
+    if self._key_fragments and self._key_fragments[0] == keys:
+      return self._key_fragments[1]
+
+    def fragment(key, pressed):
+      return NSAttributedString.alloc().initWithString_attributes_(
+        to_halfwidth(key.replace("-", "")), {
+          NSFontAttributeName:
+            key_list_bold_font(key) if pressed else key_list_font(key),
+          NSForegroundColorAttributeName:
+            StenoKeyView.DARK if pressed else StenoKeyView.LIGHT,
+        })
+
+    fragments = [(key, fragment(key, False), fragment(key, True)) for key in keys]
+    self._key_fragments = (keys, fragments)
+    self._labels.clear()
+    return fragments
+
   def labelForKeys_(self, keys):
+    fragments = self.keyFragments()
+    keys = frozenset(keys)
+    if keys in self._labels:
+      self._labels.move_to_end(keys)
+      return self._labels[keys]
+
     string = NSMutableAttributedString.alloc().init()
-    keys = set(keys)
-    for key in system.KEYS:
-      string.appendAttributedString_(
-        NSAttributedString.alloc().initWithString_attributes_(
-          to_halfwidth(key.replace("-", "")), {
-            NSFontAttributeName:
-              key_list_bold_font(key) if key in keys else key_list_font(key),
-            NSForegroundColorAttributeName:
-              StenoKeyView.DARK if key in keys else StenoKeyView.LIGHT,
-          }))
+    for key, light, bold in fragments:
+      string.appendAttributedString_(bold if key in keys else light)
 
     ALL = NSMakeRange(0, len(system.KEYS))
     string.setAlignment_range_(NSTextAlignmentCenter, ALL)
-    if not any(map(is_korean, system.KEYS)):
+    if Script.KOREAN not in key_scripts(tuple(system.KEYS)).values():
       string.addAttribute_value_range_(NSKernAttributeName, 3, ALL)
+
+    self._labels[keys] = string
+    if len(self._labels) > LABEL_CACHE_SIZE:
+      self._labels.popitem(last=False)
     return string
 
   def displayStroke_(self, keys):
@@ -114,4 +153,4 @@ class LayoutDisplayController(Tool):
       self.strokeLabel.setAttributedStringValue_(self.labelForKeys_(keys)),
       self.displayController.displayStroke_(keys),
       self.displayView.setNeedsDisplay_(True),
-    do_async(_displayStroke)
+    do_async(_displayStroke, key=(self, "displayStroke"))
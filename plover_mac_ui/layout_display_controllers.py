@@ -3,6 +3,7 @@ from Quartz import CGPointMake
 from objc import IBOutlet, ivar, super
 
 from plover_mac_ui.async_utils import do_async
+from plover_mac_ui.keymap_index import build_index, view_state
 from plover_mac_ui.resources import BUNDLE
 
 class DisplayController(NSViewController):
@@ -10,19 +11,36 @@ class DisplayController(NSViewController):
   engine = ivar()
   keymap = ivar()
   reverse_keymap = ivar()
+  key_actions = ivar()
   machine_keymap = ivar()
   actionMenu = ivar()
   selection = ivar()
   delegate = ivar()
+  hooked = ivar()
 
   def initWithEngine_(self, engine):
     self = super(DisplayController, self).initWithNibName_bundle_(self.nibName, BUNDLE)
     if self is None: return None
     self.engine = engine
-    self.engine.hook_connect("config_changed", self.configDidChange_)
     self.keymap = {}
+    self.key_actions = {}
+    self.activate()
     return self
 
+  def activate(self):
+    if self.hooked:
+      return
+    self.engine.hook_connect("config_changed", self.configDidChange_)
+    self.hooked = True
+    if self.isViewLoaded():
+      self.configDidChange_(self.engine.config)
+
+  def deactivate(self):
+    if not self.hooked:
+      return
+    self.engine.hook_disconnect("config_changed", self.configDidChange_)
+    self.hooked = False
+
   def awakeFromNib(self):
     self.configureKeymap()
     self.actionMenu = NSMenu.alloc().initWithTitle_("")
@@ -35,22 +53,19 @@ class DisplayController(NSViewController):
   def configureKeymap(self):
     pass
 
+  def currentKeymap(self):
+    if self.delegate:
+      return self.delegate.keymapForDisplayController_(self)
+    return self.engine.config["system_keymap"]
+
   def configDidChange_(self, config):
-    self.machine_keymap = self.engine.config["system_keymap"]
-    self.reverse_keymap = {
-      view: [key for key in self.keymap if self.keymap[key] == view]
-      for view in self.keymap.values()
-    }
+    self.machine_keymap = self.currentKeymap()
+    self.key_actions, self.reverse_keymap = build_index(self.keymap, self.machine_keymap)
 
-    noops = {view for view, keys in self.reverse_keymap.items()
-      if all(self.machine_keymap.get_action(key) in {None, "no-op"}
-        for key in keys)}
-    for view in self.reverse_keymap:
-      view.disabled = view in noops
-      labels = {self.machine_keymap.get_action(key) for key in self.reverse_keymap[view]}
-      labels.discard(None)
-      view.fullLabel = list(labels)[0] if labels else ""
+    for view, keys in self.reverse_keymap.items():
+      view.disabled, view.fullLabel = view_state([self.key_actions[key] for key in keys])
       view.label = view.fullLabel.replace("-", "")[:3]
+      view.invalidateCaches()
       view.setNeedsDisplay_(True)
 
     if not self.actionMenu:
@@ -89,7 +104,7 @@ class DisplayController(NSViewController):
     if not key:
       return
     key = key[0]
-    action = self.machine_keymap.get_action(key) or "no-op"
+    action = self.key_actions.get(key) or "no-op"
     self.selection = key
 
     self.actionMenu.itemWithTitle_(action).setState_(NSOnState)
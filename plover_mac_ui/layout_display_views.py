@@ -51,12 +51,18 @@ class StenoKeyView(DisplayView):
   SEMI_DARK = colors.SEMI_DARK
   LIGHT = colors.LIGHT
 
-  def drawRect_(self, rect):
-    super(StenoKeyView, self).drawRect_(rect)
+  outline = ivar()
+  labelCache = ivar()
 
-    NSGraphicsContext.currentContext().setShouldAntialias_(True)
+  def invalidateCaches(self):
+    self.outline = None
+    self.labelCache = None
+
+  def outlineForSize_(self, size):
+    cache_key = (size.width, size.height, self.rounded, self.roundSide)
+    if self.outline and self.outline[0] == cache_key:
+      return self.outline[1], self.outline[2]
 
-    size = rect.size
     radius = (size.width - 10 if self.roundSide else size.width) / 2
     path = NSBezierPath.bezierPath()
     path.setLineWidth_(1.5)
@@ -80,6 +86,50 @@ class StenoKeyView(DisplayView):
       path.lineToPoint_(NSMakePoint(1, 1))
     path.closePath()
 
+    self.outline = (cache_key, path, radius)
+    return path, radius
+
+  def labelForSize_radius_(self, size, radius):
+    frame_size = self.frame().size
+    cache_key = (
+      self.label, self.fullLabel, self.showFullLabel, bool(self.highlighted),
+      frame_size.width, frame_size.height, size.width, size.height)
+    if self.labelCache is None:
+      self.labelCache = {}
+    if cache_key in self.labelCache:
+      return self.labelCache[cache_key]
+
+    label_color = NSColor.whiteColor() if self.highlighted else self.DARK
+    label = NSAttributedString.alloc().initWithString_attributes_(
+      self.fullLabel if \
+        frame_size.width >= 3 * frame_size.height \
+        or (self.showFullLabel and len(self.fullLabel) < 3) else self.label,
+      {
+        NSFontAttributeName:
+          SMALL_KEY_NAME_FONT if len(self.label) >= 3 else
+            key_name_font(self.label),
+        NSForegroundColorAttributeName: label_color,
+      })
+    label_size = label.size()
+    origin = NSMakePoint(size.width / 2 - label_size.width / 2, size.height / 2 - label_size.height / 2 + 2)
+    if self.roundSide:
+      origin.x += (size.width - 2 * radius) / 3 * (1 if self.roundSide == "right" else -1)
+    if self.rounded:
+      origin.y += 2
+    if len(self.label) >= 3:
+      origin.y -= 1
+
+    self.labelCache[cache_key] = (label, origin)
+    return label, origin
+
+  def drawRect_(self, rect):
+    super(StenoKeyView, self).drawRect_(rect)
+
+    NSGraphicsContext.currentContext().setShouldAntialias_(True)
+
+    size = rect.size
+    path, radius = self.outlineForSize_(size)
+
     if self.disabled:
       (self.SEMI_DARK if self.darkOutlineWhenDisabled else self.LIGHT).set()
       path.stroke()
@@ -91,23 +141,5 @@ class StenoKeyView(DisplayView):
     path.stroke()
 
     if self.label:
-      label_color = NSColor.whiteColor() if self.highlighted else self.DARK
-      label = NSAttributedString.alloc().initWithString_attributes_(
-        self.fullLabel if \
-          self.frame().size.width >= 3 * self.frame().size.height \
-          or (self.showFullLabel and len(self.fullLabel) < 3) else self.label,
-        {
-          NSFontAttributeName:
-            SMALL_KEY_NAME_FONT if len(self.label) >= 3 else
-              key_name_font(self.label),
-          NSForegroundColorAttributeName: label_color,
-        })
-      label_size = label.size()
-      origin = NSMakePoint(size.width / 2 - label_size.width / 2, size.height / 2 - label_size.height / 2 + 2)
-      if self.roundSide:
-        origin.x += (size.width - 2 * radius) / 3 * (1 if self.roundSide == "right" else -1)
-      if self.rounded:
-        origin.y += 2
-      if len(self.label) >= 3:
-        origin.y -= 1
+      label, origin = self.labelForSize_radius_(size, radius)
       label.drawAtPoint_(origin)
@@ -1,5 +1,3 @@
-from functools import partial
-
 from AppKit import (
   NSCollectionViewFlowLayout,
   NSCollectionViewItem,
@@ -11,11 +9,11 @@ from Foundation import NSObject
 from objc import IBAction, IBOutlet, ivar, protocolNamed, super
 
 from plover_mac_ui.async_utils import do_async
+from plover_mac_ui.latency import traced
 from plover_mac_ui.lookup_model import (
-  Dictionary,
   LookupMethod,
   LookupResultReason,
-  MAX_RESULTS,
+  dictionary_for,
 )
 from plover_mac_ui.lookup_word_list import (
   WordListItem,
@@ -45,6 +43,7 @@ class LookupToolController(Tool, protocols=[
   actionText = "Lookup"
   shortcut = "l"
   nibName = "Lookup"
+  showOnHooks = ("lookup",)
   lookupMethod = IBOutlet()
   searchField = IBOutlet()
   splitView = IBOutlet()
@@ -58,8 +57,13 @@ class LookupToolController(Tool, protocols=[
   dictionary = ivar()
 
   def completeInit(self):
-    self.engine.hook_connect("lookup", self.asyncShowWindow)
-    self.engine.hook_connect("dictionaries_loaded", self.dictionariesDidLoad_)
+    self.dictionary = dictionary_for(self.engine.dictionaries, lock=self.engine)
+    self._signature = self.dictionary.signature()
+    self._query = None
+    self._generation = 0
+    self._paging = (0, None)
+    self.engine.hook_connect("dictionaries_loaded",
+      traced(self.dictionariesDidLoad_, "LookupToolController"))
 
     self.wordListNib = nib_named(WordListItem.nibName)
     self.translationListNib = nib_named(TranslationListItem.nibName)
@@ -86,8 +90,16 @@ class LookupToolController(Tool, protocols=[
     self.translationList.registerNib_forItemWithIdentifier_(self.translationListNib, TranslationListItem.identifier)
 
   def dictionariesDidLoad_(self, dic):
-    self.dictionary = dic
-    do_async(self.clearResults)
+    self.dictionary = dictionary_for(dic, lock=self.engine)
+    signature = self.dictionary.signature()
+    if signature != self._signature:
+      self._signature = signature
+      do_async(self.refreshResults)
+
+  def refreshResults(self):
+    if self.lookupMethod is not None and self.searchField.stringValue():
+      self.translationListController.updateTranslations_lookingUpBy_([], self.lookupBy)
+      self.performLookup()
 
   def clearResults(self):
     if self.lookupMethod is not None:
@@ -101,24 +113,37 @@ class LookupToolController(Tool, protocols=[
 
   @debounce(0.1)
   def performLookup(self):
-    approx_fn, lookup_fn = {
-      LookupMethod.TRANSLATION: (Dictionary.approx_translations, Dictionary.find_by_translation),
-      LookupMethod.STROKE: (Dictionary.approx_strokes, Dictionary.find_by_stroke),
-    }[self.lookupBy]
-    approx, lookup = partial(approx_fn, self.dictionary), partial(lookup_fn, self.dictionary)
-
+    lookup_by = self.lookupBy
     search_text = __import__("os").environ.get(
       "PLOVER_SEARCH", self.searchField.stringValue() or "")
 
-    fullResults = {}
-    results = []
-    if search_text:
-      for tl in approx(search_text):
-        full_results, short_results = lookup(tl)
-        fullResults[tl] = full_results
-        results.extend(short_results)
-
-    self.wordListController.updateResults_full_lookingUpBy_(results, fullResults, self.lookupBy)
+    self._generation += 1
+    generation = self._generation
+    self._query = (lookup_by, search_text)
+    page = self.dictionary.lookup_page(lookup_by, search_text) if search_text else None
+    do_async(self.showPage_generation_append_, page, generation, False)
+
+  # Pages are computed on the debounce timer thread and shown on the main
+  # thread; a page for a query that has since changed is dropped there.
+  @debounce(0.05)
+  def loadMoreResults(self):
+    generation, cursor = self._paging
+    if cursor is None:
+      return
+    page = self.dictionary.lookup_page(cursor.method, cursor.key, cursor=cursor)
+    do_async(self.showPage_generation_append_, page, generation, True)
+
+  def showPage_generation_append_(self, page, generation, append):
+    if generation != self._generation:
+      return
+    results, fullResults, cursor = page if page is not None else ([], {}, None)
+    self._paging = (generation, cursor)
+    self.wordListController.setHasMore_(cursor is not None)
+    if append:
+      self.wordListController.appendResults_full_(results, fullResults)
+    else:
+      self.wordListController.updateResults_full_lookingUpBy_(
+        results, fullResults, self._query[0])
 
   def forceRelayout(self):
     self.wordList.collectionViewLayout().invalidateLayout()
@@ -159,6 +184,9 @@ class LookupToolController(Tool, protocols=[
   def wordListDidUpdateResults(self):
     self.wordList.reloadData()
 
+  def wordListNeedsMoreResults(self):
+    self.loadMoreResults()
+
   def wordListDidSelectItem_withTranslations_lookingUpBy_(self, item, translations, lookup_by):
     self.translationListController.updateTranslations_lookingUpBy_(translations, lookup_by)
 
@@ -0,0 +1,61 @@
+from hashlib import sha1
+import os
+import pickle
+import tempfile
+
+from plover import log
+from plover.oslayer.config import CONFIG_DIR
+from plover.resource import ASSET_SCHEME, resource_filename
+
+CACHE_DIR = os.path.join(CONFIG_DIR, "mac_ui", "lookup_index")
+CACHE_VERSION = 1
+
+# Dictionaries are keyed by the path the engine knows them by: "asset:"
+# resources as given, files by their absolute path.
+def resource_name(path):
+  if path.startswith(ASSET_SCHEME):
+    return path
+  return os.path.abspath(path)
+
+def cache_key(path):
+  try:
+    stat = os.stat(resource_filename(path))
+  except (OSError, ValueError):
+    return None
+  return (CACHE_VERSION, resource_name(path), stat.st_mtime_ns, stat.st_size)
+
+def cache_path(path):
+  return os.path.join(CACHE_DIR, sha1(resource_name(path).encode()).hexdigest())
+
+def load_index(path):
+  key = cache_key(path)
+  if key is None:
+    return None
+  try:
+    with open(cache_path(path), "rb") as f:
+      cached_key, payload = pickle.load(f)
+  except FileNotFoundError:
+    return None
+  except Exception:
+    # A truncated or corrupt pickle can raise almost anything.
+    log.debug("ignoring unreadable lookup index cache for %s", path, exc_info=True)
+    return None
+  if cached_key != key or not isinstance(payload, dict):
+    return None
+  return payload
+
+def save_index(path, payload):
+  key = cache_key(path)
+  if key is None:
+    return
+  temp = None
+  try:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+      pickle.dump((key, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, cache_path(path))
+  except OSError:
+    log.warning("could not write lookup index cache for %s", path, exc_info=True)
+    if temp is not None and os.path.exists(temp):
+      os.remove(temp)
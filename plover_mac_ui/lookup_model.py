@@ -1,19 +1,44 @@
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from enum import Enum
+import os
 import re
 from os.path import relpath
+from threading import Lock, Thread
 
-from plover import system
+from plover import log, system
 from plover.oslayer.config import CONFIG_DIR
 from plover.resource import ASSET_SCHEME
 from plover.steno import sort_steno_strokes
+from plover_mac_ui.lookup_cache import load_index, save_index
+from plover_mac_ui.paging import page_of
 from plover_mac_ui.resources import icon_named
-from plover_mac_ui.steno import STROKE_DELIMITER
+from plover_mac_ui.steno import STROKE_DELIMITER, dictionary_stamp
 
 Translation = namedtuple("Translation", "strokes translation dictionary comment bad reason")
 Translation.__new__.__defaults__ = (None,) * len(Translation._fields)
 
-MAX_RESULTS = 50
+DEFAULT_MAX_RESULTS = 50
+
+# Results per lookup page; set PLOVER_LOOKUP_MAX_RESULTS to change it.
+def max_results_from_env(environ=os.environ):
+  value = environ.get("PLOVER_LOOKUP_MAX_RESULTS")
+  if value is None:
+    return DEFAULT_MAX_RESULTS
+  try:
+    limit = int(value)
+  except ValueError:
+    limit = 0
+  if limit < 1:
+    log.warning("ignoring invalid PLOVER_LOOKUP_MAX_RESULTS %r", value)
+    return DEFAULT_MAX_RESULTS
+  return limit
+
+MAX_RESULTS = max_results_from_env()
+
+LookupCursor = namedtuple("LookupCursor", "method key after")
+LookupPage = namedtuple("LookupPage", "results full_results cursor")
 
 class LookupMethod(Enum):
   TRANSLATION = 0
@@ -62,24 +87,135 @@ def dict_short_name(path):
   return path.rsplit(".", 1)[0]
 
 
+INDEX_FIELDS = {"size", "strokes", "translations"}
+
+class DictionaryIndex:
+  # lock guards reads of the dictionary against the engine changing it.
+  def __init__(self, d, lock=None):
+    lock = lock or nullcontext()
+    self.dictionary = d
+    self.short_name = Dictionary.short_dict_name(d)
+    with lock:
+      self.stamp = dictionary_stamp(d)
+    self.size = self.stamp[1]
+
+    cached = load_index(d.path)
+    if cached is not None and cached.keys() >= INDEX_FIELDS and cached["size"] == self.size:
+      self.strokes = cached["strokes"]
+      self.translations = cached["translations"]
+      return
+
+    with lock:
+      self.stamp = dictionary_stamp(d)
+      strokes = list(d._dict)
+      translations = list(d.reverse)
+    self.size = self.stamp[1]
+    self.strokes = [
+      (STROKE_DELIMITER.join(outline).upper(), outline) for outline in strokes]
+    self.translations = [(tl.lower(), tl) for tl in translations]
+    save_index(d.path, {
+      "size": self.size,
+      "strokes": self.strokes,
+      "translations": self.translations,
+    })
+
 class Dictionary:
+  def __init__(self, collection=None, lock=None):
+    self.collection = collection
+    self.lock = lock
+    self.indexes = {}
+    self._lock = Lock()
+
+  @property
+  def dicts(self):
+    return self.collection.dicts if self.collection is not None else []
+
   @staticmethod
   def short_dict_name(dict):
     path = relpath(dict.path, CONFIG_DIR)
     return dict_short_name(path) or path
 
-  def approx_translations(self, key):
+  def index_for(self, d):
+    with self._lock:
+      index = self.indexes.get(d.path)
+    if index is None or index.stamp != dictionary_stamp(d):
+      index = DictionaryIndex(d, self.lock)
+      with self._lock:
+        self.indexes[d.path] = index
+    return index
+
+  def signature(self):
+    return tuple((d.path, d.enabled, *dictionary_stamp(d)) for d in self.dicts)
+
+  def prune(self):
+    paths = {d.path for d in self.dicts}
+    with self._lock:
+      for path in [path for path in self.indexes if path not in paths]:
+        del self.indexes[path]
+
+  def warm_up_one(self, d):
+    try:
+      self.index_for(d)
+    except Exception:
+      log.warning("could not build the lookup index for %s", d.path, exc_info=True)
+
+  def warm_up(self, progress=None, workers=None):
+    self.prune()
+    dicts = self.dicts
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+      for done, _ in enumerate(pool.map(self.warm_up_one, dicts), 1):
+        if progress:
+          progress(done, len(dicts))
+
+  def warm_up_async(self, progress=None):
+    Thread(target=self.warm_up, kwargs={"progress": progress},
+      name="lookup-warm-up", daemon=True).start()
+
+  def approx_translations_page(self, key, limit=None, offset=0, after=None):
     translations = {key}
+    lower_key = key.lower()
     for d in self.dicts:
-      translations |= {tl for tl in d.reverse if key.lower() in tl.lower()}
-    return sorted(translations, key=lambda tl: (rank_approx(key, tl), len(tl), tl))[:MAX_RESULTS]
+      translations |= {
+        tl for lower_tl, tl in self.index_for(d).translations if lower_key in lower_tl}
+    return page_of(translations, lambda tl: (rank_approx(key, tl), len(tl), tl),
+      limit or MAX_RESULTS, offset, after)
 
-  def approx_strokes(self, key):
+  def approx_strokes_page(self, key, limit=None, offset=0, after=None):
     strokes = {tuple(key.split(STROKE_DELIMITER))}
+    upper_key = key.upper()
     for d in self.dicts:
-      strokes |= {tl for tl in d._dict if key.upper() in STROKE_DELIMITER.join(tl).upper()}
-    return sorted(strokes, key=lambda tl: (
-      rank_approx(key, STROKE_DELIMITER.join(tl)), len(tl), sum(map(len, tl)), tl))[:MAX_RESULTS]
+      strokes |= {
+        tl for upper_tl, tl in self.index_for(d).strokes if upper_key in upper_tl}
+    return page_of(strokes, lambda tl: (
+      rank_approx(key, STROKE_DELIMITER.join(tl)), len(tl), sum(map(len, tl)), tl),
+      limit or MAX_RESULTS, offset, after)
+
+  def approx_translations(self, key, limit=None):
+    return self.approx_translations_page(key, limit)[0]
+
+  def approx_strokes(self, key, limit=None):
+    return self.approx_strokes_page(key, limit)[0]
+
+  def lookup_page(self, method, key, limit=None, offset=0, cursor=None):
+    after = None
+    if cursor is not None:
+      if (cursor.method, cursor.key) != (method, key):
+        raise ValueError("cursor belongs to a different lookup")
+      after = cursor.after
+
+    if method == LookupMethod.TRANSLATION:
+      approx_page, find = self.approx_translations_page, self.find_by_translation
+    else:
+      approx_page, find = self.approx_strokes_page, self.find_by_stroke
+
+    matches, after = approx_page(key, limit, offset, after)
+    results = []
+    full_results = {}
+    for match in matches:
+      full_results[match], short_results = find(match)
+      results.extend(short_results)
+    return LookupPage(results, full_results,
+      LookupCursor(method, key, after) if after is not None else None)
 
   def find_by_translation(self, key):
     strokes = set()
@@ -93,7 +229,7 @@ class Dictionary:
     existing_strokes = set()
     full_results = []
     for d in self.dicts:
-      path = Dictionary.short_dict_name(d)
+      path = self.index_for(d).short_name
       for stroke in strokes:
         match = d.get(stroke)
         if match:
@@ -133,7 +269,7 @@ class Dictionary:
     existing_strokes = set()
     full_results = []
     for d in self.dicts:
-      path = Dictionary.short_dict_name(d)
+      path = self.index_for(d).short_name
       match = d.get(key) or None
 
       if not match:
@@ -158,3 +294,19 @@ class Dictionary:
       )
     ] if defined_results else []
     return full_results, short_results
+
+_dictionary = None
+_dictionary_lock = Lock()
+
+def dictionary_for(collection, lock=None):
+  global _dictionary
+  with _dictionary_lock:
+    if _dictionary is None:
+      _dictionary = Dictionary(collection)
+    _dictionary.collection = collection
+    if lock is not None:
+      _dictionary.lock = lock
+    return _dictionary
+
+def log_warm_up_progress(done, total):
+  log.debug("lookup index: %d/%d dictionaries ready", done, total)
@@ -13,6 +13,9 @@ from plover_mac_ui.lookup_format import format_for_word_list
 from plover_mac_ui.lookup_model import LookupMethod
 from plover_mac_ui.steno import STROKE_DELIMITER
 
+# Ask for the next page once an item this close to the end is displayed.
+LOAD_MORE_THRESHOLD = 10
+
 NSCollectionViewDataSource = protocolNamed("NSCollectionViewDataSource")
 NSCollectionViewDelegate = protocolNamed("NSCollectionViewDelegate")
 NSCollectionViewDelegateFlowLayout = protocolNamed("NSCollectionViewDelegateFlowLayout")
@@ -92,6 +95,8 @@ class WordListController(NSObject, protocols=[
   fullResults = ivar()
   lookupBy = ivar()
   delegate = ivar()
+  hasMore = ivar()
+  loadingMore = ivar()
 
   def init(self):
     self = super(WordListController, self).init()
@@ -108,9 +113,20 @@ class WordListController(NSObject, protocols=[
     self.fullResults = full
     self.results = short
     self.lookupBy = lookup_by
+    self.loadingMore = False
+    if self.delegate:
+      self.delegate.wordListDidUpdateResults()
+
+  def appendResults_full_(self, short, full):
+    self.fullResults = {**self.fullResults, **full}
+    self.results = list(self.results) + list(short)
+    self.loadingMore = False
     if self.delegate:
       self.delegate.wordListDidUpdateResults()
 
+  def setHasMore_(self, more):
+    self.hasMore = more
+
   # MARK: NSCollectionViewDataSource
 
   def numberOfSectionsInCollectionView_(self, view):
@@ -137,6 +153,14 @@ class WordListController(NSObject, protocols=[
 
   # MARK: NSCollectionViewDelegate
 
+  def collectionView_willDisplayItem_forRepresentedObjectAtIndexPath_(self, view, item, path):
+    if not self.hasMore or self.loadingMore:
+      return
+    if path.item() >= len(self.results) - LOAD_MORE_THRESHOLD:
+      self.loadingMore = True
+      if self.delegate:
+        self.delegate.wordListNeedsMoreResults()
+
   def collectionView_didSelectItemsAtIndexPaths_(self, view, paths):
     if self.selection is not None:
       self.selection.setSelected_(False)
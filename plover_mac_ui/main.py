@@ -1,50 +1,47 @@
 import os
 
-from AppKit import (
-  NSAlert,
-  NSApplication,
-  NSAttributedString,
-  NSFont,
-  NSFontAttributeName,
-  NSMakeRect,
-  NSTextView,
-)
-from PyObjCTools import AppHelper
+from plover_mac_ui import startup
+
+with startup.phase("import AppKit"):
+  from AppKit import (
+    NSAlert,
+    NSApplication,
+    NSAttributedString,
+    NSFont,
+    NSFontAttributeName,
+    NSMakeRect,
+    NSTextView,
+  )
+  from PyObjCTools import AppHelper
+
+with startup.phase("import plover"):
+  from plover import log
+  from plover.oslayer import keyboardcontrol
+  from plover.registry import registry
 
-from plover import log
-from plover.oslayer import keyboardcontrol
-from plover.registry import registry
-from plover_mac_ui.app_delegate import AppDelegate
+from plover_mac_ui.emulation import (
+  CHUNK_SIZE, RETURN_KEYCODE, ChunkedSender, sender_options_from_env,
+)
 from plover_mac_ui.engine import Engine
 from plover_mac_ui.fonts import DEFAULT_FONT
 from plover_mac_ui.resources import plover_logo
-from plover_mac_ui.utils import every
 
 class KeyboardEmulation(keyboardcontrol.KeyboardEmulation):
-  LIMIT_PER_STRING = 20
+  LIMIT_PER_STRING = CHUNK_SIZE
 
   def __init__(self):
     super(keyboardcontrol.KeyboardEmulation, self).__init__()
     self.improved = True
+    self.sender = ChunkedSender(
+      self._send_string_press,
+      lambda: self._send_sequence([(RETURN_KEYCODE, True)]),
+      **sender_options_from_env(min_size=self.LIMIT_PER_STRING))
 
   def send_string(self, s):
     if not self.improved:
       return super().send_string(s)
 
-    if "\n" in s:
-      parts = s.split("\n")
-      parts = sum([[part, "\n"] for part in parts[:-1]], []) + [parts[-1]]
-      for part in parts:
-        if not part:
-          continue
-        if part == "\n":
-          self._send_sequence([(36, True)])
-        else:
-          self.send_string(part)
-      return
-
-    for substr in every(self.LIMIT_PER_STRING, s):
-      self._send_string_press(substr)
+    self.sender.send(s)
 
 def show_error(title, body):
   alert = NSAlert.alloc().init()
@@ -62,13 +59,15 @@ def show_error(title, body):
 
 def main(config, controller):
   engine = Engine(config, controller, KeyboardEmulation())
-  if not engine.load_config():
-    return 3
+  with startup.phase("load config"):
+    if not engine.load_config():
+      return 3
 
   # Add Mac UI tools as a plugin type
-  registry.PLUGIN_TYPES += ("gui.mac.tool",)
-  registry._plugins["gui.mac.tool"] = {}
-  registry.update()
+  with startup.phase("load tool plugins"):
+    registry.PLUGIN_TYPES += ("gui.mac.tool",)
+    registry._plugins["gui.mac.tool"] = {}
+    registry.update()
 
   # Add hooks
   engine.HOOKS.append("emulation_changed")
@@ -78,10 +77,14 @@ def main(config, controller):
   from better_rtf import RtfDictionary
   registry.register_plugin("dictionary", "rtf", RtfDictionary)
 
-  delegate = AppDelegate.alloc().initWithEngine_(engine)
-  NSApplication.sharedApplication().setDelegate_(delegate)
+  with startup.phase("import app delegate"):
+    from plover_mac_ui.app_delegate import AppDelegate
+  with startup.phase("create app delegate"):
+    delegate = AppDelegate.alloc().initWithEngine_(engine)
+    NSApplication.sharedApplication().setDelegate_(delegate)
 
-  engine.start()
+  with startup.phase("start engine"):
+    engine.start()
   try:
     AppHelper.runEventLoop()
   except KeyboardInterrupt:
@@ -0,0 +1,14 @@
+import heapq
+
+# Sort keys must be unique, so resuming after the last key of a page neither
+# skips nor repeats a candidate.
+def page_of(candidates, sort_key, limit, offset=0, after=None):
+  if limit < 1:
+    raise ValueError(f"page limit must be positive, not {limit}")
+  keyed = ((sort_key(c), c) for c in candidates)
+  if after is not None:
+    keyed = ((k, c) for k, c in keyed if k > after)
+  page = heapq.nsmallest(offset + limit + 1, keyed)[offset:]
+  more = len(page) > limit
+  page = page[:limit]
+  return [c for _, c in page], (page[-1][0] if more else None)
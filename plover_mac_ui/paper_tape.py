@@ -1,3 +1,5 @@
+from collections import deque
+
 from AppKit import (
   NSFont,
   NSFontAttributeName,
@@ -10,10 +12,13 @@ from objc import IBOutlet
 from plover import system
 from plover_mac_ui.async_utils import do_async
 from plover_mac_ui.colors import DARK
-from plover_mac_ui.fonts import is_zh_ja, is_korean, to_halfwidth, paper_tape_font
+from plover_mac_ui.fonts import to_halfwidth, paper_tape_font
+from plover_mac_ui.hook_worker import offloaded
+from plover_mac_ui.scripts import Script, dominant_script, script_of
 from plover_mac_ui.tool import Tool
 
 LINES = 40
+BUFFERED_STROKES = 1000
 
 class PaperTapeController(Tool):
   actionText = "Paper Tape"
@@ -24,7 +29,12 @@ class PaperTapeController(Tool):
   def completeInit(self):
     self._numbers = None
     self._all_keys = []
-    self.engine.hook_connect("stroked", self.didStroke_)
+    self._column_scripts = []
+    self._wide_columns = []
+    self._buffered = deque(maxlen=BUFFERED_STROKES)
+    self._buffering = False
+    self.addWindowHook_handler_("stroked",
+      offloaded(self.didStroke_, source="PaperTapeController"))
 
   def awakeFromNib(self):
     self.configDidChange_(self.engine.config)
@@ -33,6 +43,8 @@ class PaperTapeController(Tool):
   def configDidChange_(self, config):
     self._numbers = set(system.NUMBERS.values())
     self._all_keys = "".join(key.strip("-") for key in system.KEYS)
+    self._column_scripts = [script_of(key) for key in self._all_keys]
+    self._wide_columns = [script is Script.ZH_JA for script in self._column_scripts]
     if self.tape:
       self.tape.setString_("\n" * LINES)
       self.scrollToBottom()
@@ -40,7 +52,7 @@ class PaperTapeController(Tool):
       self.tape.setFont_(font)
 
       test_str = NSAttributedString.alloc().initWithString_attributes_(
-        "".join(["\u3000" if is_zh_ja(key) else " " for key in self._all_keys]),
+        "".join(["\u3000" if wide else " " for wide in self._wide_columns]),
         { NSFontAttributeName: font })
       frame = self.win.frame()
       frame.size.width = test_str.size().width + 10
@@ -58,6 +70,7 @@ class PaperTapeController(Tool):
     do_async(
       self.tape.scrollRangeToVisible_,
       NSMakeRange(self.tape.string().length(), 0),
+      key=(self, "scrollToBottom"),
     )
 
   def paperFormat_(self, stroke):
@@ -65,16 +78,32 @@ class PaperTapeController(Tool):
     keys = stroke.steno_keys[:]
     if any(key in self._numbers for key in keys):
       keys.append('#')
-    for key in keys:
-      index = system.KEY_ORDER[key]
+    columns = [system.KEY_ORDER[key] for key in keys]
+    for index in columns:
       text[index] = self._all_keys[index]
-    if is_korean(text):
+    script = dominant_script(self._column_scripts[index] for index in columns)
+    if script is Script.KOREAN:
       text = "".join([to_halfwidth(ch) for ch in text])
-    elif is_zh_ja(text):
+    elif script is Script.ZH_JA:
       for i, char in enumerate(text):
-        if char == " " and is_zh_ja(self._all_keys[i]):
+        if char == " " and self._wide_columns[i]:
           text[i:i + 1] = ["\u3000"]
     return ''.join(text)
 
+  def windowDidHide(self):
+    self._buffering = True
+    self.engine.hook_connect("stroked", self._buffered.append)
+
+  def windowWillShow(self):
+    if self._buffering:
+      self._buffering = False
+      self.engine.hook_disconnect("stroked", self._buffered.append)
+
+  def windowDidShow(self):
+    if self._buffered:
+      strokes = list(self._buffered)
+      self._buffered.clear()
+      self.appendToTape_("\n".join(map(self.paperFormat_, strokes)))
+
   def didStroke_(self, stroke):
-    self.appendToTape_(self.paperFormat_(stroke))
+    do_async(self.appendToTape_, self.paperFormat_(stroke))
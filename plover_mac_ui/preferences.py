@@ -1,7 +1,7 @@
 from serial import Serial
-from serial.tools.list_ports import comports
 
-from AppKit import NSOffState, NSOnState
+from AppKit import NSOffState, NSOnState, NSPopUpButtonWillPopUpNotification
+from Foundation import NSNotificationCenter
 from objc import IBAction, IBOutlet, ivar
 
 from plover import system
@@ -10,12 +10,16 @@ from plover.machine.keyboard import Keyboard
 from plover.machine.keymap import Keymap
 from plover.registry import registry
 from plover_mac_ui.async_utils import do_async
+from plover_mac_ui.keymap_edit import COMMIT_DELAY, KeymapEdit
+from plover_mac_ui.display_pool import DisplayControllerPool
 from plover_mac_ui.layout_model import display_controller_for
+from plover_mac_ui.serial_ports import port_scanner, port_title
 from plover_mac_ui.systems import (
   MACHINE_NAMES, SYSTEM_NAMES,
   pretty_machine_name, pretty_system_name,
 )
 from plover_mac_ui.tool import Tool
+from plover_mac_ui.utils import debounce
 
 class PreferencesController(Tool):
   actionText = "Preferences..."
@@ -46,12 +50,23 @@ class PreferencesController(Tool):
   RtsCts = IBOutlet()
 
   displayController = ivar()
+  keymapEdit = ivar()
 
   serial_options = ivar()
   keyboard_options = ivar()
 
   _parities = ivar()
 
+  def completeInit(self):
+    self._display_pool = DisplayControllerPool(self.engine, display_controller_for)
+
+  def windowDidShow(self):
+    self._display_pool.resume()
+
+  def windowDidHide(self):
+    self.commitKeymapEdit()
+    self._display_pool.suspend()
+
   def awakeFromNib(self):
     self.populateSystems_initialValue_(self.systemList, system.NAME)
     self.populateMachines_initialValue_(
@@ -72,6 +87,10 @@ class PreferencesController(Tool):
 
     self._parities = [title[0] for title in self.parity.itemTitles()]
 
+    # Opening the port menu rescans, so newly plugged in devices show up.
+    NSNotificationCenter.defaultCenter().addObserver_selector_name_object_(
+      self, "refreshSerialPorts:", NSPopUpButtonWillPopUpNotification, self.port)
+
     self.machineDidChange_system_tab_(
       self.current_machine, self.current_system, self.current_tab)
 
@@ -116,10 +135,13 @@ class PreferencesController(Tool):
     return issubclass(self.current_machine.obj, SerialStenotypeBase)
 
   def tabView_didSelectTabViewItem_(self, view, item):
+    self.commitKeymapEdit()
     self.machineDidChange_system_tab_(
       self.current_machine, self.current_system, self.current_tab)
 
   def configDidChange_(self, config):
+    if "system_keymap" in config:
+      self.keymapEdit = None
     if not self.tabView:  # nib not initialized
       return
     self.machineList1.selectItemWithTitle_(
@@ -133,11 +155,13 @@ class PreferencesController(Tool):
 
   @IBAction
   def changeMachine_(self, sender):
+    self.commitKeymapEdit()
     with self.engine:
       self.engine._update({"machine_type": sender.selectedItem().representedObject().name})
 
   @IBAction
   def changeSystem_(self, sender):
+    self.commitKeymapEdit()
     with self.engine:
       self.engine._update({"system_name": sender.selectedItem().representedObject().name})
 
@@ -150,6 +174,7 @@ class PreferencesController(Tool):
             self.engine._config._OPTIONS["machine_specific_options"].default(
               None, [None, self.current_machine.name])})
     elif self.current_tab == "Keymap":
+      self.keymapEdit = None
       default_keymap = self.engine._config._OPTIONS["system_keymap"].default(
         None, [None, self.current_system.name, self.current_machine.name])
       keymap = Keymap(default_keymap.get_keys(), default_keymap.get_actions())
@@ -169,20 +194,38 @@ class PreferencesController(Tool):
     with self.engine:
       self.engine._update({"machine_specific_options": {prop: value}})
 
+  @IBAction
+  def refreshSerialPorts_(self, sender):
+    port_scanner.refresh(self.asyncPopulateSerialPorts_)
+
+  def asyncPopulateSerialPorts_(self, ports):
+    do_async(self.populateSerialPorts_, ports)
+
   def scanSerialPorts(self):
-    self.port.removeAllItems()
-    self.port.addItemWithTitle_("")
-    for port in comports():
-      title = port.device if not port.description or port.description == "n/a" \
-        else f"{port.description} ({port.device})"
-      self.port.addItemWithTitle_(title)
-      self.port.lastItem().setRepresentedObject_(port)
+    self.populateSerialPorts_(port_scanner.ports(self.asyncPopulateSerialPorts_))
+
+  def populateSerialPorts_(self, ports):
+    # Items are updated in place rather than cleared, because a rescan
+    # started by opening the menu can finish while the menu is still open.
+    entries = [("", None)] + [(port_title(port), port) for port in ports]
+    titles = {title for title, _ in entries}
+    for index in reversed(range(self.port.numberOfItems())):
+      if self.port.itemAtIndex_(index).title() not in titles:
+        self.port.removeItemAtIndex_(index)
+    for index, (title, port) in enumerate(entries):
+      current = self.port.indexOfItemWithTitle_(title)
+      if current != index:
+        if current != -1:
+          self.port.removeItemAtIndex_(current)
+        self.port.insertItemWithTitle_atIndex_(title, index)
+      self.port.itemAtIndex_(index).setRepresentedObject_(port)
 
     if "port" in self.machine_config:
       self.port.selectItemWithTitle_(self.machine_config["port"])
 
   def machineDidChange_system_tab_(self, mach, sys, tab):
-    self.scanSerialPorts()
+    if self.is_serial:
+      self.scanSerialPorts()
 
     self.enableOutputAtStartup.setState_(
       NSOnState if self.engine.config.get("auto_start") else NSOffState)
@@ -223,11 +266,12 @@ class PreferencesController(Tool):
       self.RtsCts.setState_(NSOnState if self.machine_config.get("rtscts") else NSOffState)
 
     try:
-      self.displayController = (
-        display_controller_for(self.engine.config["machine_type"])
-          .alloc().initWithEngine_(self.engine))
+      controller = self._display_pool.controller_for(self.engine.config["machine_type"])
     except KeyError:
       return
+    if controller is self.displayController:
+      return
+    self.displayController = controller
     self.registerClickHandlers_(self.displayController)
     self.displayController.setDelegate_(self)
 
@@ -328,10 +372,21 @@ class PreferencesController(Tool):
       self.setMachineConfig_toValue_("rtscts", sender.state() == NSOnState)
 
   def didSelectAction_forKey_(self, action, key):
-    old_keymap = self.engine.config["system_keymap"]
-    keymap = Keymap(old_keymap.get_keys(), old_keymap.get_actions())
-    bindings = old_keymap.get_bindings()
-    bindings[key] = action
-    keymap.set_bindings(bindings)
-    with self.engine:
-      self.engine._update({"system_keymap": keymap})
+    if self.keymapEdit is None:
+      self.keymapEdit = KeymapEdit(self.engine.config["system_keymap"])
+    self.keymapEdit.set_action(key, action)
+    self.scheduleKeymapCommit()
+
+  def keymapForDisplayController_(self, controller):
+    if self.keymapEdit is not None:
+      return self.keymapEdit.keymap
+    return self.engine.config["system_keymap"]
+
+  @debounce(COMMIT_DELAY)
+  def scheduleKeymapCommit(self):
+    do_async(self.commitKeymapEdit)
+
+  def commitKeymapEdit(self):
+    edit, self.keymapEdit = self.keymapEdit, None
+    if edit is not None:
+      edit.commit(self.engine)
@@ -0,0 +1,31 @@
+from enum import Enum
+from functools import lru_cache
+
+class Script(Enum):
+  LATIN = 0
+  ZH_JA = 1
+  KOREAN = 2
+
+@lru_cache(maxsize=4096)
+def script_of(text):
+  script = Script.LATIN
+  for c in text:
+    code = ord(c)
+    if 0x3130 <= code < 0x3190:
+      return Script.KOREAN
+    if code > 0x3000:
+      script = Script.ZH_JA
+  return script
+
+def dominant_script(scripts):
+  return max(scripts, key=lambda script: script.value, default=Script.LATIN)
+
+@lru_cache(maxsize=None)
+def key_scripts(keys):
+  return {key: script_of(key) for key in keys}
+
+def is_korean(text):
+  return script_of(text) is Script.KOREAN
+
+def is_zh_ja(text):
+  return script_of(text) is Script.ZH_JA
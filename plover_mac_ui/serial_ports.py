@@ -0,0 +1,74 @@
+from threading import Lock, Thread
+from time import monotonic
+
+from serial.tools.list_ports import comports
+
+PORT_SCAN_TTL = 10.0
+
+def port_title(port):
+  if not port.description or port.description == "n/a":
+    return port.device
+  return f"{port.description} ({port.device})"
+
+class PortScanner:
+  def __init__(self, ttl=PORT_SCAN_TTL, scan=comports, clock=monotonic):
+    self.ttl = ttl
+    self._scan = scan
+    self._clock = clock
+    self._lock = Lock()
+    self._ports = []
+    self._scanned_at = None
+    self._scanning = False
+    self._callbacks = []
+
+  @property
+  def stale(self):
+    return self._scanned_at is None or self._clock() - self._scanned_at > self.ttl
+
+  # The first call scans in the caller's thread, so there is a port list
+  # to show; later calls return the cached list and rescan in the
+  # background once it is stale.
+  def ports(self, callback=None):
+    if self._scanned_at is None:
+      ports = list(self._scan())
+      with self._lock:
+        self._store(ports)
+    elif self.stale:
+      self.refresh(callback)
+    with self._lock:
+      return list(self._ports)
+
+  # Callbacks passed while a scan is running are called when it finishes.
+  def refresh(self, callback=None):
+    with self._lock:
+      if callback:
+        self._callbacks.append(callback)
+      if self._scanning:
+        return
+      self._scanning = True
+    Thread(target=self._refresh, name="serial-port-scan", daemon=True).start()
+
+  def _refresh(self):
+    try:
+      ports = list(self._scan())
+    except Exception:
+      with self._lock:
+        self._scanning = False
+        self._callbacks = []
+      raise
+    with self._lock:
+      self._scanning = False
+      callbacks, self._callbacks = self._callbacks, []
+      changed = self._store(ports)
+    if changed:
+      for callback in callbacks:
+        callback(ports)
+
+  # Called with _lock held; returns whether the device list changed.
+  def _store(self, ports):
+    changed = [port.device for port in ports] != [port.device for port in self._ports]
+    self._ports = ports
+    self._scanned_at = self._clock()
+    return changed
+
+port_scanner = PortScanner()
@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from time import perf_counter
+import builtins
+import os
+import sys
+
+from plover import log
+
+# Set PLOVER_STARTUP_TIMING to log how long each startup phase took, and
+# which module imports were the slowest.
+enabled = "PLOVER_STARTUP_TIMING" in os.environ
+
+SLOWEST_IMPORTS = 20
+
+_started = perf_counter()
+_phases = []
+_imports = []
+_import = builtins.__import__
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+  if level or name in sys.modules:
+    return _import(name, globals, locals, fromlist, level)
+  start = perf_counter()
+  try:
+    return _import(name, globals, locals, fromlist, level)
+  finally:
+    _imports.append((name, perf_counter() - start))
+
+def track_imports():
+  builtins.__import__ = _timed_import
+
+def untrack_imports():
+  if builtins.__import__ is _timed_import:
+    builtins.__import__ = _import
+
+@contextmanager
+def phase(name):
+  start = perf_counter()
+  try:
+    yield
+  finally:
+    _phases.append((name, start - _started, perf_counter() - start))
+
+def mark(name):
+  _phases.append((name, perf_counter() - _started, 0.0))
+
+# Import times include the modules each import pulled in.
+def report():
+  lines = [f"{'phase':<32} {'at (ms)':>9} {'took (ms)':>10}"]
+  for name, at, took in _phases:
+    lines.append(f"{name:<32} {at * 1000:>9.1f} {took * 1000:>10.1f}")
+  if _imports:
+    lines.append("")
+    lines.append(f"{'import':<42} {'took (ms)':>10}")
+    slowest = sorted(_imports, key=lambda item: item[1], reverse=True)[:SLOWEST_IMPORTS]
+    for name, took in slowest:
+      lines.append(f"{name:<42} {took * 1000:>10.1f}")
+  return "\n".join(lines)
+
+def log_report():
+  untrack_imports()
+  if enabled:
+    log.info("Mac UI startup:\n%s", report())
+
+if enabled:
+  track_imports()
@@ -1 +1,9 @@
 STROKE_DELIMITER = "/"
+
+# Changes whenever a dictionary is replaced, grows or shrinks, or is saved;
+# engine.add_translation saves, so it also covers overwritten entries.
+def dictionary_stamp(d):
+  return id(d), len(d), getattr(d, "timestamp", None)
+
+def dictionaries_stamp(dicts):
+  return tuple(dictionary_stamp(d) for d in dicts)
@@ -1,4 +1,4 @@
-import re
+from collections import OrderedDict
 
 from AppKit import (
   NSAttributedString,
@@ -9,15 +9,21 @@ from AppKit import (
 )
 from objc import IBOutlet, protocolNamed
 
-from plover.formatting import RetroFormatter
-from plover.suggestions import Suggestion
 from plover_mac_ui.async_utils import do_async
 from plover_mac_ui.fonts import (
   SUGGESTIONS_FONT,
   suggestions_steno_font,
   to_halfwidth,
 )
-from plover_mac_ui.steno import STROKE_DELIMITER
+from plover_mac_ui.hook_worker import offloaded
+from plover_mac_ui.steno import STROKE_DELIMITER, dictionaries_stamp
+from plover_mac_ui.suggestions_model import (
+  FRAGMENT_CACHE_SIZE,
+  RenderedList,
+  SuggestionCache,
+  suggestion_key,
+  suggestions_for_last_words,
+)
 from plover_mac_ui.tool import Tool
 
 NSWindowDelegate = protocolNamed("NSWindowDelegate")
@@ -26,27 +32,28 @@ class SuggestionsToolController(Tool, protocols=[NSWindowDelegate]):
   actionText = "Suggestions"
   shortcut = "z"
   nibName = "Suggestions"
+  showOnHooks = ("suggestions",)
 
   tape = IBOutlet()
 
-  WORD_RX = re.compile(r'(?:\w+|[^\w\s]+)\s*')
-
   def completeInit(self):
     self._last_suggestions = None
-    self.engine.hook_connect("suggestions", self.asyncShowWindow)
-    self.engine.hook_connect("translated", self.didTranslateFrom_to_)
+    self._rendered = RenderedList()
+    self._fragments = OrderedDict()
+    self._suggestions = SuggestionCache(self.engine.get_suggestions,
+      stamp=lambda: dictionaries_stamp(self.engine.dictionaries.dicts))
+    self.engine.hook_connect("dictionaries_loaded", self._suggestions.clear)
+    self.addWindowHook_handler_("translated",
+      offloaded(self.didTranslateFrom_to_, key="suggestions",
+        source="SuggestionsToolController"))
 
   def scrollToBottom(self):
     do_async(
       self.tape.scrollRangeToVisible_,
       NSMakeRange(self.tape.string().length(), 0),
+      key=(self, "scrollToBottom"),
     )
 
-  @staticmethod
-  def tails_(lst):
-    for i in range(len(lst)):
-      yield lst[i:]
-
   def didTranslateFrom_to_(self, old, new):
     for a in reversed(new):
       if a.text and not a.text.isspace():
@@ -54,41 +61,49 @@ class SuggestionsToolController(Tool, protocols=[NSWindowDelegate]):
     else:
       return
 
-    with self.engine:
-      last_translations = self.engine.translator_state.translations
-      retro_formatter = RetroFormatter(last_translations)
-      split_words = retro_formatter.last_words(10, rx=self.WORD_RX)
-
-    suggestion_list = []
-    for phrase in self.tails_(split_words):
-      phrase = ''.join(phrase)
-      suggestion_list.extend(self.engine.get_suggestions(phrase))
-
-    if not suggestion_list and split_words:
-      suggestion_list = [Suggestion(split_words[-1], [])]
+    suggestion_list = suggestions_for_last_words(self.engine, self._suggestions,
+      source="SuggestionsToolController")
 
     if suggestion_list and suggestion_list != self._last_suggestions:
       self._last_suggestions = suggestion_list
-      self.showSuggestions_(suggestion_list)
+      do_async(self.showSuggestions_, suggestion_list)
+
+  def fragmentForSuggestion_(self, sug):
+    key = suggestion_key(sug)
+    if key in self._fragments:
+      self._fragments.move_to_end(key)
+      return self._fragments[key]
+
+    word = NSMutableAttributedString.alloc().initWithString_attributes_(
+      f"{sug.text}\n", { NSFontAttributeName: SUGGESTIONS_FONT })
+    for steno in sug.steno_list:
+      stroke = STROKE_DELIMITER.join(steno)
+      word.appendAttributedString_(
+        NSAttributedString.alloc().initWithString_attributes_(
+          f"  {stroke}\n",
+          { NSFontAttributeName: suggestions_steno_font(stroke) }))
+    word.appendAttributedString_(
+      NSAttributedString.alloc().initWithString_attributes_(
+        "\n", { NSFontAttributeName: SUGGESTIONS_FONT }))
+
+    self._fragments[key] = word
+    if len(self._fragments) > FRAGMENT_CACHE_SIZE:
+      self._fragments.popitem(last=False)
+    return word
 
   def showSuggestions_(self, suggestion_list):
     if not self.tape:
       return
 
-    self.tape.setString_("")
-
-    for sug in suggestion_list:
-      word = NSMutableAttributedString.alloc().initWithString_attributes_(
-        f"{sug.text}\n", { NSFontAttributeName: SUGGESTIONS_FONT })
-      for steno in sug.steno_list:
-        stroke = STROKE_DELIMITER.join(steno)
-        word.appendAttributedString_(
-          NSAttributedString.alloc().initWithString_attributes_(
-            f"  {stroke}\n",
-            { NSFontAttributeName: suggestions_steno_font(stroke) }))
-      word.appendAttributedString_(
-        NSAttributedString.alloc().initWithString_attributes_(
-          "\n", { NSFontAttributeName: SUGGESTIONS_FONT }))
-      self.tape.textStorage().appendAttributedString_(word)
+    storage = self.tape.textStorage()
+    keep, offset, added = self._rendered.diff(suggestion_list)
+    fragments = [self.fragmentForSuggestion_(sug) for sug in added]
+
+    storage.beginEditing()
+    storage.deleteCharactersInRange_(NSMakeRange(offset, storage.length() - offset))
+    for fragment in fragments:
+      storage.appendAttributedString_(fragment)
+    storage.endEditing()
 
+    self._rendered.update(keep, added, [fragment.length() for fragment in fragments])
     self.scrollToBottom()
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from threading import Lock
+from time import perf_counter
+import re
+
+from plover.formatting import RetroFormatter
+from plover.suggestions import Suggestion
+
+from plover_mac_ui import latency
+
+CACHE_SIZE = 1024
+FRAGMENT_CACHE_SIZE = 256
+TRANSLATION_TAIL = 40
+WORD_COUNT = 10
+WORD_RX = re.compile(r'(?:\w+|[^\w\s]+)\s*')
+
+def phrase_tails(words):
+  tails = []
+  phrase = ""
+  for word in reversed(words):
+    phrase = word + phrase
+    tails.append(phrase)
+  return tails[::-1]
+
+def suggestion_key(suggestion):
+  return suggestion.text, tuple(map(tuple, suggestion.steno_list))
+
+def common_prefix(old, new):
+  length = 0
+  for a, b in zip(old, new):
+    if a != b:
+      break
+    length += 1
+  return length
+
+class RenderedList:
+  def __init__(self):
+    self.items = []
+    self.lengths = []
+
+  def diff(self, items):
+    keep = common_prefix(self.items, items)
+    return keep, sum(self.lengths[:keep]), items[keep:]
+
+  def update(self, keep, added, lengths):
+    self.items = self.items[:keep] + list(added)
+    self.lengths = self.lengths[:keep] + list(lengths)
+
+class SuggestionCache:
+  def __init__(self, lookup, size=CACHE_SIZE, stamp=None):
+    self._lookup = lookup
+    self._size = size
+    self._entries = OrderedDict()
+    self._lock = Lock()
+    self._stamp_fn = stamp
+    self._stamp = None
+
+  def clear(self, *args):
+    with self._lock:
+      self._entries.clear()
+
+  def validate(self):
+    if self._stamp_fn is None:
+      return
+    stamp = self._stamp_fn()
+    with self._lock:
+      if stamp != self._stamp:
+        self._entries.clear()
+        self._stamp = stamp
+
+  def get(self, phrase):
+    with self._lock:
+      if phrase in self._entries:
+        self._entries.move_to_end(phrase)
+        return self._entries[phrase]
+
+    suggestions = self._lookup(phrase)
+    with self._lock:
+      self._entries[phrase] = suggestions
+      if len(self._entries) > self._size:
+        self._entries.popitem(last=False)
+    return suggestions
+
+  def suggestions_for(self, words):
+    self.validate()
+    suggestion_list = []
+    for phrase in phrase_tails(words):
+      suggestion_list.extend(self.get(phrase))
+    return suggestion_list
+
+def snapshot_translations(engine, count=TRANSLATION_TAIL, source=None):
+  with engine:
+    start = perf_counter()
+    translations = engine.translator_state.translations
+    translations = translations[-count:] if count else translations[:]
+    held = perf_counter() - start
+  if source and latency.enabled:
+    latency.stats.record(source, "lock_hold", held)
+  return translations
+
+def last_words(engine, count, rx, source=None):
+  translations = snapshot_translations(engine, source=source)
+  words = RetroFormatter(translations).last_words(count, rx=rx)
+  if len(words) < count and len(translations) >= TRANSLATION_TAIL:
+    # Fingerspelling and translations without words can need a longer tail.
+    translations = snapshot_translations(engine, count=None, source=source)
+    words = RetroFormatter(translations).last_words(count, rx=rx)
+  return words
+
+# Everything SuggestionsToolController does per translated word before
+# handing the list to the main thread.
+def suggestions_for_last_words(engine, cache, source=None):
+  words = last_words(engine, WORD_COUNT, WORD_RX, source=source)
+  suggestion_list = cache.suggestions_for(words)
+  if not suggestion_list and words:
+    suggestion_list = [Suggestion(words[-1], [])]
+  return suggestion_list
@@ -9,6 +9,7 @@ class Tool(NSWindowController):
   actionText = None
   shortcut = None
   nibName = None
+  showOnHooks = ()
   win = IBOutlet()
 
   def initWithEngine_(self, engine):
@@ -16,6 +17,8 @@ class Tool(NSWindowController):
     if self is None: return None
 
     self.engine = engine
+    self._window_hooks = []
+    self._window_hooks_connected = False
     engine.hook_connect("config_changed", self.configDidChange_)
     self.completeInit()
     return self
@@ -31,14 +34,50 @@ class Tool(NSWindowController):
     super(Tool, self).showWindow_(sender)
     if not self.win.isVisible():
       self.win.center()
+    self.win.setDelegate_(self)
     self.win.makeKeyAndOrderFront_(sender)
     self.win.orderFrontRegardless()
+    if not self._window_hooks_connected:
+      with self.engine:
+        self.windowWillShow()
+        self.connectWindowHooks()
+      self.windowDidShow()
 
   def asyncShowWindow(self):
     do_async(self.showWindow_, self)
 
+  def windowWillClose_(self, notification):
+    if self._window_hooks_connected:
+      with self.engine:
+        self.disconnectWindowHooks()
+        self.windowDidHide()
+
+  def addWindowHook_handler_(self, hook, handler):
+    self._window_hooks.append((hook, handler))
+
+  def connectWindowHooks(self):
+    with self.engine:
+      for hook, handler in self._window_hooks:
+        self.engine.hook_connect(hook, handler)
+    self._window_hooks_connected = True
+
+  def disconnectWindowHooks(self):
+    with self.engine:
+      for hook, handler in self._window_hooks:
+        self.engine.hook_disconnect(hook, handler)
+    self._window_hooks_connected = False
+
   def completeInit(self):
     pass
 
+  def windowWillShow(self):
+    pass
+
+  def windowDidShow(self):
+    pass
+
+  def windowDidHide(self):
+    pass
+
   def configDidChange_(self, config):
     pass
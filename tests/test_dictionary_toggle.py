@@ -0,0 +1,70 @@
+from threading import RLock
+
+import pytest
+
+from plover.config import Config, DictionaryConfig
+from plover.steno_dictionary import StenoDictionary, StenoDictionaryCollection
+
+from plover_mac_ui.dictionary_toggle import toggle_dictionary
+
+class FakeEngine:
+  def __init__(self, config, dicts):
+    self._config = config
+    self._lock = RLock()
+    self.dictionaries = StenoDictionaryCollection(dicts)
+    self.updates = []
+    self.hooks = []
+
+  def __enter__(self):
+    self._lock.acquire()
+    return self
+
+  def __exit__(self, *exc):
+    self._lock.release()
+
+  @property
+  def config(self):
+    # Config.as_dict needs the plugin registry, so only copy what is used.
+    return {"dictionaries": self._config["dictionaries"]}
+
+  def _update(self, config):
+    self.updates.append(config)
+
+  def _trigger_hook(self, hook, *args):
+    self.hooks.append((hook, args))
+
+def make_dictionary(path):
+  d = StenoDictionary()
+  d.path = path
+  return d
+
+@pytest.fixture
+def engine(tmp_path):
+  config = Config(str(tmp_path / "plover.cfg"))
+  paths = [str(tmp_path / f"{name}.json") for name in "abc"]
+  config.update(dictionaries=[DictionaryConfig(path) for path in paths])
+  return FakeEngine(config, [make_dictionary(path) for path in paths[:2]])
+
+def test_toggles_a_loaded_dictionary_in_place(engine):
+  live = engine.dictionaries
+  assert toggle_dictionary(engine, 1) is False
+  assert not live.dicts[1].enabled
+  assert engine.updates == []
+
+  saved = Config(engine._config.path)
+  saved.load()
+  assert [d.enabled for d in saved["dictionaries"]] == [True, False, True]
+
+  [(hook, (collection,))] = engine.hooks
+  assert hook == "dictionaries_loaded"
+  assert collection is not live
+  assert collection.dicts == live.dicts
+
+  assert toggle_dictionary(engine, 1) is True
+  assert live.dicts[1].enabled
+
+def test_unloaded_dictionary_goes_through_update(engine):
+  assert toggle_dictionary(engine, 2) is False
+  [update] = engine.updates
+  assert [d.enabled for d in update["dictionaries"]] == [True, True, False]
+  assert engine.hooks == []
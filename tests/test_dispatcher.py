@@ -0,0 +1,61 @@
+from plover_mac_ui.dispatcher import CoalescingDispatcher
+
+class FakeMainQueue:
+  def __init__(self):
+    self.blocks = []
+
+  def dispatch(self, block):
+    self.blocks.append(block)
+
+  def run(self):
+    blocks, self.blocks = self.blocks, []
+    for block in blocks:
+      block()
+
+def test_one_block_per_drain():
+  queue = FakeMainQueue()
+  dispatcher = CoalescingDispatcher(queue.dispatch)
+  calls = []
+  for i in range(5):
+    dispatcher.submit(calls.append, i)
+  assert len(queue.blocks) == 1
+  queue.run()
+  assert calls == [0, 1, 2, 3, 4]
+
+  dispatcher.submit(calls.append, 5)
+  assert len(queue.blocks) == 1
+  queue.run()
+  assert calls[-1] == 5
+
+def test_keyed_submissions_keep_only_the_latest():
+  queue = FakeMainQueue()
+  dispatcher = CoalescingDispatcher(queue.dispatch)
+  calls = []
+  dispatcher.submit(calls.append, "scroll 1", key="scroll")
+  dispatcher.submit(calls.append, "label")
+  dispatcher.submit(calls.append, "scroll 2", key="scroll")
+  queue.run()
+  assert calls == ["label", "scroll 2"]
+
+def test_failing_callback_does_not_stop_the_drain():
+  queue = FakeMainQueue()
+  dispatcher = CoalescingDispatcher(queue.dispatch)
+  calls = []
+
+  def fail():
+    raise RuntimeError("boom")
+
+  dispatcher.submit(fail)
+  dispatcher.submit(calls.append, "after")
+  queue.run()
+  assert calls == ["after"]
+
+def test_submit_from_a_callback_schedules_another_drain():
+  queue = FakeMainQueue()
+  dispatcher = CoalescingDispatcher(queue.dispatch)
+  calls = []
+  dispatcher.submit(lambda: dispatcher.submit(calls.append, "nested"))
+  queue.run()
+  assert calls == []
+  queue.run()
+  assert calls == ["nested"]
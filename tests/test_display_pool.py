@@ -0,0 +1,96 @@
+from collections import defaultdict
+
+import pytest
+
+from plover_mac_ui.display_pool import DisplayControllerPool
+
+class FakeEngine:
+  def __init__(self):
+    self.hooks = defaultdict(list)
+
+  def hook_connect(self, hook, callback):
+    self.hooks[hook].append(callback)
+
+  def hook_disconnect(self, hook, callback):
+    self.hooks[hook].remove(callback)
+
+  def change_config(self, config):
+    for callback in list(self.hooks["config_changed"]):
+      callback(config)
+
+class FakeController:
+  created = 0
+
+  @classmethod
+  def alloc(cls):
+    FakeController.created += 1
+    return cls()
+
+  def initWithEngine_(self, engine):
+    self.engine = engine
+    self.hooked = False
+    self.changes = 0
+    self.activate()
+    return self
+
+  def activate(self):
+    if not self.hooked:
+      self.engine.hook_connect("config_changed", self.configDidChange_)
+      self.hooked = True
+
+  def deactivate(self):
+    if self.hooked:
+      self.engine.hook_disconnect("config_changed", self.configDidChange_)
+      self.hooked = False
+
+  def configDidChange_(self, config):
+    self.changes += 1
+
+class StenotypeController(FakeController):
+  pass
+
+class QwertyController(FakeController):
+  pass
+
+CONTROLLERS = {"TX Bolt": StenotypeController, "Keyboard": QwertyController}
+
+@pytest.fixture
+def engine():
+  FakeController.created = 0
+  return FakeEngine()
+
+def test_reuses_controller_per_machine_type(engine):
+  pool = DisplayControllerPool(engine, CONTROLLERS.__getitem__)
+  first = pool.controller_for("TX Bolt")
+  assert pool.controller_for("TX Bolt") is first
+  assert isinstance(pool.controller_for("Keyboard"), QwertyController)
+  assert pool.controller_for("TX Bolt") is first
+
+def test_unknown_machine_raises_key_error(engine):
+  pool = DisplayControllerPool(engine, CONTROLLERS.__getitem__)
+  with pytest.raises(KeyError):
+    pool.controller_for("Unknown")
+
+def test_no_leaks_after_many_config_changes(engine):
+  pool = DisplayControllerPool(engine, CONTROLLERS.__getitem__)
+  machines = list(CONTROLLERS)
+  for i in range(1000):
+    controller = pool.controller_for(machines[i % len(machines)])
+    engine.change_config({"system_keymap": i})
+
+  assert FakeController.created == len(CONTROLLERS)
+  assert engine.hooks["config_changed"] == [controller.configDidChange_]
+  assert sum(c.changes for c in pool.controllers.values()) == 1000
+
+def test_suspend_and_resume(engine):
+  pool = DisplayControllerPool(engine, CONTROLLERS.__getitem__)
+  controller = pool.controller_for("TX Bolt")
+  pool.suspend()
+  engine.change_config({})
+  assert controller.changes == 0
+  assert engine.hooks["config_changed"] == []
+  pool.resume()
+  pool.resume()
+  engine.change_config({})
+  assert controller.changes == 1
+  assert len(engine.hooks["config_changed"]) == 1
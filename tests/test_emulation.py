@@ -0,0 +1,109 @@
+import pytest
+
+from plover_mac_ui.emulation import (
+  CHUNK_SIZE, EventKind, ChunkedSender, chunk_sizes, plan_chunks, plan_string,
+  sender_options_from_env,
+)
+from plover_mac_ui.utils import every
+
+# KeyboardEmulation.send_string before the event plan, recording what it sent.
+def old_plan(s, limit=CHUNK_SIZE):
+  events = []
+  if "\n" in s:
+    parts = s.split("\n")
+    parts = sum([[part, "\n"] for part in parts[:-1]], []) + [parts[-1]]
+    for part in parts:
+      if not part:
+        continue
+      if part == "\n":
+        events.append((EventKind.RETURN, "\n"))
+      else:
+        events.extend(old_plan(part, limit))
+    return events
+  return [(EventKind.TEXT, substr) for substr in every(limit, s)]
+
+def new_plan(s, limit=CHUNK_SIZE):
+  return [(event.kind, event.text) for event in plan_string(s, limit)]
+
+@pytest.mark.parametrize("s", [
+  "",
+  "a",
+  "x" * 20,
+  "x" * 21,
+  "hello\n",
+  "\nhello",
+  "\n\n",
+  "one\ntwo\n\nthree",
+  "lorem ipsum dolor sit amet " * 40 + "\n" + "consectetur\n" * 5,
+])
+def test_plan_matches_old_behavior(s):
+  assert new_plan(s) == old_plan(s)
+
+def test_plan_matches_old_behavior_for_a_long_macro():
+  s = "\n".join(f"line {i}: " + "boilerplate " * (i % 9) for i in range(400))
+  assert len(s) > 5000
+  assert new_plan(s) == old_plan(s)
+  assert new_plan(s, 7) == old_plan(s, 7)
+
+def test_plan_chunks_marks_returns_with_newlines():
+  assert list(plan_chunks("abcde\n\nf", 2)) == ["ab", "cd", "e", "\n", "\n", "f"]
+  assert list(plan_chunks("abcdefgh", 1, 4)) == ["a", "bc", "defg", "h"]
+
+def test_chunk_sizes_grow_to_the_maximum():
+  sizes = chunk_sizes(20, 80)
+  assert [next(sizes) for _ in range(5)] == [20, 40, 80, 80, 80]
+
+def test_growing_chunks_keep_text_and_returns():
+  s = "a" * 100 + "\n" + "b" * 10
+  events = list(plan_string(s, 20, 80))
+  assert [len(e.text) for e in events] == [20, 40, 40, 1, 10]
+  assert "".join(e.text for e in events) == s
+
+def test_sender_defaults_to_fixed_chunks():
+  sent = []
+  sender = ChunkedSender(sent.append, lambda: sent.append("\n"))
+  sender.send("x" * 50 + "\ny")
+  assert sent == ["x" * 20, "x" * 20, "x" * 10, "\n", "y"]
+  assert sender.events == 5
+  assert sender.characters == 52
+
+def test_sender_sleeps_between_events_only():
+  sleeps = []
+  sender = ChunkedSender(lambda text: None, lambda: None,
+    min_size=2, delay=0.5, sleep=sleeps.append)
+  sender.send("abcdef")
+  assert sleeps == [0.5, 0.5]
+
+@pytest.mark.parametrize("size", [0, -1])
+def test_chunk_size_must_be_positive(size):
+  with pytest.raises(ValueError):
+    plan_string("abc", size)
+  with pytest.raises(ValueError):
+    ChunkedSender(print, print, min_size=size)
+
+def test_sender_options_default():
+  assert sender_options_from_env({}) == {
+    "min_size": CHUNK_SIZE, "max_size": CHUNK_SIZE, "delay": 0.0}
+
+def test_sender_options_from_env():
+  environ = {
+    "PLOVER_EMULATION_MIN_CHUNK": "10",
+    "PLOVER_EMULATION_MAX_CHUNK": "40",
+    "PLOVER_EMULATION_DELAY": "0.01",
+  }
+  assert sender_options_from_env(environ) == {
+    "min_size": 10, "max_size": 40, "delay": 0.01}
+
+@pytest.mark.parametrize("environ, expected", [
+  ({"PLOVER_EMULATION_MIN_CHUNK": "0"}, (20, 20, 0.0)),
+  ({"PLOVER_EMULATION_MIN_CHUNK": "-5"}, (20, 20, 0.0)),
+  ({"PLOVER_EMULATION_MIN_CHUNK": "big"}, (20, 20, 0.0)),
+  ({"PLOVER_EMULATION_MIN_CHUNK": "30", "PLOVER_EMULATION_MAX_CHUNK": "10"}, (30, 30, 0.0)),
+  ({"PLOVER_EMULATION_MAX_CHUNK": "1.5"}, (20, 20, 0.0)),
+  ({"PLOVER_EMULATION_DELAY": "-1"}, (20, 20, 0.0)),
+  ({"PLOVER_EMULATION_DELAY": "nan"}, (20, 20, 0.0)),
+  ({"PLOVER_EMULATION_DELAY": "soon"}, (20, 20, 0.0)),
+])
+def test_invalid_sender_options_fall_back(environ, expected):
+  options = sender_options_from_env(environ)
+  assert (options["min_size"], options["max_size"], options["delay"]) == expected
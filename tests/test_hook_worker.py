@@ -0,0 +1,55 @@
+from threading import Event
+
+from plover_mac_ui.hook_worker import HookWorker
+
+def pending(worker):
+  return [args for _, args, _ in worker._pending.values()]
+
+def test_keyed_jobs_supersede_each_other():
+  worker = HookWorker()
+  worker.submit(print, "old", key="suggestions")
+  worker.submit(print, "stroke")
+  worker.submit(print, "new", key="suggestions")
+  assert pending(worker) == [("stroke",), ("new",)]
+  assert worker.dropped == 1
+
+def test_unkeyed_jobs_are_never_dropped():
+  worker = HookWorker(max_pending=3)
+  for i in range(10):
+    worker.submit(print, i)
+  assert pending(worker) == [(i,) for i in range(10)]
+  assert worker.dropped == 0
+
+def test_overflow_evicts_the_oldest_keyed_job():
+  worker = HookWorker(max_pending=3)
+  worker.submit(print, 0)
+  worker.submit(print, "a", key="a")
+  worker.submit(print, 1)
+  worker.submit(print, "b", key="b")
+  assert pending(worker) == [(0,), (1,), ("b",)]
+  assert worker.dropped == 1
+
+def test_runs_jobs_in_order():
+  worker = HookWorker(name="test")
+  done = Event()
+  calls = []
+  worker.submit(calls.append, 1)
+  worker.submit(calls.append, 2, key="two")
+  worker.submit(lambda: done.set())
+  worker.start()
+  assert done.wait(5)
+  worker.stop()
+  assert calls == [1, 2]
+
+def test_failing_job_does_not_stop_the_worker():
+  worker = HookWorker(name="test")
+  done = Event()
+
+  def fail():
+    raise RuntimeError("boom")
+
+  worker.submit(fail)
+  worker.submit(done.set)
+  worker.start()
+  assert done.wait(5)
+  worker.stop()
@@ -0,0 +1,49 @@
+from plover_mac_ui.import_graph import (
+  STARTUP_MODULES, eager_closure, module_imports, package_graph,
+)
+
+SOURCE = '''
+import os
+from plover_mac_ui import latency, startup
+from plover_mac_ui.fonts import DEFAULT_FONT
+
+with startup.phase("import AppKit"):
+  from AppKit import NSApplication
+
+def main():
+  from plover_mac_ui.app_delegate import AppDelegate
+
+class Tool:
+  def show(self):
+    import serial
+'''
+
+def test_module_imports():
+  eager, deferred = module_imports(SOURCE)
+  assert eager == {
+    "os", "plover_mac_ui.latency", "plover_mac_ui.startup",
+    "plover_mac_ui.fonts", "AppKit"}
+  assert deferred == {"plover_mac_ui.app_delegate", "serial"}
+
+def test_eager_closure():
+  graph = {
+    "main": ({"plover_mac_ui.fonts", "AppKit"}, {"plover_mac_ui.app_delegate"}),
+    "fonts": ({"plover_mac_ui.scripts"}, set()),
+    "scripts": ({"enum"}, set()),
+    "app_delegate": ({"serial"}, set()),
+  }
+  local, external = eager_closure(graph, ["main"])
+  assert local == {"main", "fonts", "scripts"}
+  assert external == {"AppKit", "enum"}
+
+def test_package_graph_covers_the_startup_modules():
+  graph = package_graph()
+  assert set(STARTUP_MODULES) <= set(graph)
+  local, _ = eager_closure(graph, STARTUP_MODULES)
+  assert "app_delegate" in local
+  assert "import_graph" not in local
+
+def test_preferences_are_not_loaded_at_startup():
+  local, external = eager_closure(package_graph(), STARTUP_MODULES)
+  assert not {"preferences", "serial_ports", "keymap_edit"} & local
+  assert "serial" not in external
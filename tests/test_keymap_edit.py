@@ -0,0 +1,62 @@
+from plover.machine.keymap import Keymap
+
+from plover_mac_ui.keymap_edit import KeymapEdit, copy_keymap
+
+KEYS = ("a", "s", "d", "f")
+ACTIONS = ("S-", "T-", "K-", "no-op")
+
+class FakeEngine:
+  def __init__(self):
+    self.updates = []
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    pass
+
+  def _update(self, config):
+    self.updates.append(config)
+
+def make_keymap():
+  keymap = Keymap(KEYS, ACTIONS)
+  keymap.set_bindings({"a": "S-", "s": "T-", "d": "K-", "f": "no-op"})
+  return keymap
+
+def test_copy_keymap():
+  keymap = make_keymap()
+  copy = copy_keymap(keymap)
+  assert copy is not keymap
+  assert copy.get_bindings() == keymap.get_bindings()
+
+def test_edits_are_staged_until_commit():
+  base = make_keymap()
+  edit = KeymapEdit(base)
+  edit.set_action("a", "T-")
+  edit.set_action("f", "K-")
+  assert edit.pending
+  assert edit.keymap.get_action("a") == "T-"
+  assert edit.keymap.get_action("f") == "K-"
+  assert base.get_action("a") == "S-"
+
+def test_commit_updates_the_engine_once():
+  engine = FakeEngine()
+  edit = KeymapEdit(make_keymap())
+  for key, action in [("a", "T-"), ("s", "S-"), ("d", "no-op"), ("f", "K-")]:
+    edit.set_action(key, action)
+  assert edit.commit(engine)
+  assert len(engine.updates) == 1
+  keymap = engine.updates[0]["system_keymap"]
+  assert keymap.get_bindings() == {"a": "T-", "s": "S-", "d": "no-op", "f": "K-"}
+  assert not edit.pending
+  assert not edit.commit(engine)
+  assert len(engine.updates) == 1
+
+def test_reverting_an_edit_leaves_nothing_to_commit():
+  engine = FakeEngine()
+  edit = KeymapEdit(make_keymap())
+  edit.set_action("a", "T-")
+  edit.set_action("a", "S-")
+  assert not edit.pending
+  assert not edit.commit(engine)
+  assert engine.updates == []
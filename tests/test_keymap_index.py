@@ -0,0 +1,16 @@
+from plover.machine.keymap import Keymap
+
+from plover_mac_ui.keymap_index import build_index, view_state
+
+def test_build_index_groups_keys_by_view():
+  machine_keymap = Keymap(("a", "q", "w", "z"), ("S-", "T-"))
+  machine_keymap.set_mappings({"S-": ("a", "q"), "T-": "w", "no-op": "z"})
+  keymap = {"a": "S view", "q": "S view", "w": "T view", "z": "spare"}
+  key_actions, reverse_keymap = build_index(keymap, machine_keymap)
+  assert key_actions == {"a": "S-", "q": "S-", "w": "T-", "z": "no-op"}
+  assert reverse_keymap == {"S view": ["a", "q"], "T view": ["w"], "spare": ["z"]}
+
+def test_view_state():
+  assert view_state(["S-", "S-"]) == (False, "S-")
+  assert view_state(["no-op", None]) == (True, "no-op")
+  assert view_state([None]) == (True, "")
@@ -0,0 +1,70 @@
+from plover_mac_ui import latency
+from plover_mac_ui.latency import (
+  Histogram, LatencyStats, current_trace, traced, tracing,
+)
+
+def test_histogram():
+  hist = Histogram(buckets=(1, 10))
+  for ms in (0.5, 0.5, 5, 50):
+    hist.record(ms)
+  assert hist.count == 4
+  assert hist.counts == [2, 1, 1]
+  assert hist.mean == (0.5 + 0.5 + 5 + 50) / 4
+  assert hist.longest == 50
+  assert hist.percentile(0.5) == 1
+  assert hist.percentile(0.75) == 10
+  assert hist.percentile(1.0) == 50
+  assert Histogram().percentile(0.5) == 0.0
+
+def test_stats_record_in_milliseconds():
+  stats = LatencyStats()
+  stats.record("Tool", "worker", 0.002)
+  hist = stats.histogram("Tool", "worker")
+  assert hist.count == 1
+  assert hist.total == 2.0
+  assert stats.histogram("Tool", "other") is None
+
+def test_stats_counters_and_report():
+  stats = LatencyStats()
+  stats.record("Tool", "worker", 0.001)
+  stats.increment("HookWorker", "dropped")
+  stats.increment("HookWorker", "dropped", 2)
+  assert stats.counter("HookWorker", "dropped") == 3
+  report = stats.report().splitlines()
+  assert report[0].split()[:2] == ["source", "phase"]
+  assert report[1].split()[:3] == ["Tool", "worker", "1"]
+  assert report[2].split() == ["HookWorker", "dropped", "3"]
+  stats.clear()
+  assert stats.counter("HookWorker", "dropped") == 0
+  assert len(stats.report().splitlines()) == 1
+
+def test_dump_to_file(tmp_path):
+  stats = LatencyStats()
+  stats.record("Tool", "worker", 0.001)
+  path = tmp_path / "latency.txt"
+  stats.dump(str(path))
+  assert path.read_text() == stats.report() + "\n"
+
+def test_tracing_nests():
+  assert current_trace() is None
+  with tracing("outer", 1.0):
+    assert current_trace() == ("outer", 1.0)
+    with tracing("inner", 2.0):
+      assert current_trace() == ("inner", 2.0)
+    assert current_trace() == ("outer", 1.0)
+  assert current_trace() is None
+
+def test_traced(monkeypatch):
+  seen = []
+
+  def record(value):
+    seen.append((value, current_trace()))
+
+  monkeypatch.setattr(latency, "enabled", False)
+  assert traced(record, "Tool") is record
+
+  monkeypatch.setattr(latency, "enabled", True)
+  traced(record, "Tool")(1)
+  assert seen[0][0] == 1
+  assert seen[0][1][0] == "Tool"
+  assert current_trace() is None
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from plover_mac_ui import lookup_cache
+from plover_mac_ui.lookup_cache import cache_path, load_index, save_index
+
+@pytest.fixture
+def dictionary(tmp_path, monkeypatch):
+  monkeypatch.setattr(lookup_cache, "CACHE_DIR", str(tmp_path / "cache"))
+  path = tmp_path / "main.json"
+  path.write_text('{"TEFT": "test"}')
+  return str(path)
+
+def test_round_trip(dictionary):
+  payload = {"size": 1, "strokes": [], "translations": []}
+  save_index(dictionary, payload)
+  assert load_index(dictionary) == payload
+  assert os.listdir(lookup_cache.CACHE_DIR) == [os.path.basename(cache_path(dictionary))]
+
+def test_missing_cache(dictionary):
+  assert load_index(dictionary) is None
+
+def test_stale_cache_is_ignored(dictionary):
+  save_index(dictionary, {"size": 1})
+  stat = os.stat(dictionary)
+  os.utime(dictionary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+  assert load_index(dictionary) is None
+
+@pytest.mark.parametrize("data", [b"", b"not a pickle", b"\x80\x05N.", b"\x80\x05K\x01."])
+def test_corrupt_cache_is_ignored(dictionary, data):
+  os.makedirs(lookup_cache.CACHE_DIR)
+  with open(cache_path(dictionary), "wb") as f:
+    f.write(data)
+  assert load_index(dictionary) is None
+
+def test_asset_dictionaries_are_cached(tmp_path, monkeypatch):
+  monkeypatch.setattr(lookup_cache, "CACHE_DIR", str(tmp_path / "cache"))
+  asset = "asset:plover:assets/main.json"
+  assert lookup_cache.cache_key(asset)[1] == asset
+  save_index(asset, {"size": 1})
+  assert load_index(asset) == {"size": 1}
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from plover_mac_ui.paging import page_of
+
+def sort_key(n):
+  return (n % 7, n)
+
+@pytest.fixture
+def candidates():
+  items = list(range(100))
+  random.Random(4).shuffle(items)
+  return items
+
+def test_first_page(candidates):
+  items, after = page_of(candidates, sort_key, 5)
+  assert items == sorted(candidates, key=sort_key)[:5]
+  assert after == sort_key(items[-1])
+
+def test_resuming_visits_every_candidate_once(candidates):
+  seen = []
+  after = None
+  while True:
+    items, after = page_of(candidates, sort_key, 15, after=after)
+    seen.extend(items)
+    if after is None:
+      break
+  assert seen == sorted(candidates, key=sort_key)
+
+def test_offset(candidates):
+  items, _ = page_of(candidates, sort_key, 10, offset=20)
+  assert items == sorted(candidates, key=sort_key)[20:30]
+
+def test_last_page_has_no_cursor():
+  items, after = page_of([3, 1, 2], lambda n: n, 3)
+  assert items == [1, 2, 3]
+  assert after is None
+  assert page_of([], lambda n: n, 3) == ([], None)
+
+def test_limit_must_be_positive():
+  with pytest.raises(ValueError):
+    page_of([1, 2], lambda n: n, 0)
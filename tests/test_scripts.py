@@ -0,0 +1,26 @@
+from plover_mac_ui.scripts import (
+  Script, dominant_script, is_korean, is_zh_ja, key_scripts, script_of,
+)
+
+def test_script_of():
+  assert script_of("STKPW") is Script.LATIN
+  assert script_of("") is Script.LATIN
+  assert script_of("あいう") is Script.ZH_JA
+  assert script_of("中") is Script.ZH_JA
+  assert script_of("ㄱㅏ") is Script.KOREAN
+  assert script_of("中ㄱ") is Script.KOREAN
+
+def test_dominant_script():
+  assert dominant_script([]) is Script.LATIN
+  assert dominant_script([Script.LATIN, Script.ZH_JA]) is Script.ZH_JA
+  assert dominant_script([Script.ZH_JA, Script.KOREAN, Script.LATIN]) is Script.KOREAN
+
+def test_key_scripts():
+  assert key_scripts(("S-", "中", "ㄱ")) == {
+    "S-": Script.LATIN, "中": Script.ZH_JA, "ㄱ": Script.KOREAN}
+
+def test_predicates():
+  assert is_korean("ㅎ")
+  assert not is_korean("中")
+  assert is_zh_ja("中")
+  assert not is_zh_ja("A")
@@ -0,0 +1,83 @@
+from collections import namedtuple
+from threading import Event
+
+from plover_mac_ui.serial_ports import PortScanner, port_title
+
+Port = namedtuple("Port", "device description")
+
+class FakeClock:
+  def __init__(self):
+    self.now = 0.0
+
+  def __call__(self):
+    return self.now
+
+class BlockingScan:
+  def __init__(self, ports):
+    self.ports = ports
+    self.calls = 0
+    self.release = Event()
+
+  def __call__(self):
+    self.calls += 1
+    assert self.release.wait(5)
+    return list(self.ports)
+
+def wait_for(callbacks, count):
+  for _ in range(500):
+    if len(callbacks) >= count:
+      return
+    Event().wait(0.01)
+  raise AssertionError(f"expected {count} callbacks, got {len(callbacks)}")
+
+def test_ports_are_cached_until_stale():
+  clock = FakeClock()
+  scan = BlockingScan([Port("/dev/a", "A")])
+  scanner = PortScanner(ttl=10, scan=scan, clock=clock)
+  scan.release.set()
+  assert scanner.ports() == [Port("/dev/a", "A")]
+  assert scanner.ports() == [Port("/dev/a", "A")]
+  assert scan.calls == 1
+
+  clock.now = 11
+  scanner.ports()
+  for _ in range(500):
+    if scan.calls == 2:
+      break
+    Event().wait(0.01)
+  assert scan.calls == 2
+
+def test_refresh_during_a_scan_keeps_its_callback():
+  scan = BlockingScan([Port("/dev/a", "A")])
+  scanner = PortScanner(scan=scan, clock=FakeClock())
+  first, second = [], []
+  scanner.refresh(first.append)
+  scanner.refresh(second.append)
+  scan.release.set()
+  wait_for(second, 1)
+  wait_for(first, 1)
+  assert scan.calls == 1
+  assert first == second == [[Port("/dev/a", "A")]]
+
+def test_rescan_callback_only_fires_on_change():
+  clock = FakeClock()
+  scan = BlockingScan([Port("/dev/a", "A")])
+  scan.release.set()
+  scanner = PortScanner(ttl=10, scan=scan, clock=clock)
+  scanner.ports()
+  unchanged, changed = [], []
+  scanner.refresh(unchanged.append)
+  for _ in range(500):
+    if scan.calls == 2 and not scanner._scanning:
+      break
+    Event().wait(0.01)
+  assert unchanged == []
+  scan.ports = [Port("/dev/a", "A"), Port("/dev/b", "B")]
+  scanner.refresh(changed.append)
+  wait_for(changed, 1)
+  assert changed == [[Port("/dev/a", "A"), Port("/dev/b", "B")]]
+
+def test_port_title():
+  assert port_title(Port("/dev/a", "Stenotype")) == "Stenotype (/dev/a)"
+  assert port_title(Port("/dev/a", "n/a")) == "/dev/a"
+  assert port_title(Port("/dev/a", None)) == "/dev/a"
@@ -0,0 +1,130 @@
+from collections import namedtuple
+
+from plover.formatting import _Action
+
+from plover_mac_ui.suggestions_model import (
+  TRANSLATION_TAIL,
+  WORD_RX,
+  RenderedList,
+  SuggestionCache,
+  common_prefix,
+  last_words,
+  phrase_tails,
+  snapshot_translations,
+  suggestion_key,
+  suggestions_for_last_words,
+)
+
+Suggestion = namedtuple("Suggestion", "text steno_list")
+Translation = namedtuple("Translation", "formatting")
+TranslatorState = namedtuple("TranslatorState", "translations")
+
+class FakeEngine:
+  def __init__(self, translations):
+    self.translator_state = TranslatorState(translations)
+    self.locked = 0
+
+  def __enter__(self):
+    self.locked += 1
+    return self
+
+  def __exit__(self, *exc):
+    self.locked -= 1
+
+def word(text):
+  return Translation([_Action(text=text)])
+
+def letter(text):
+  return Translation([_Action(text=text, prev_attach=True)])
+
+def test_phrase_tails():
+  assert phrase_tails(["a ", "b ", "c"]) == ["a b c", "b c", "c"]
+  assert phrase_tails([]) == []
+
+def test_common_prefix():
+  assert common_prefix([1, 2, 3], [1, 2, 4]) == 2
+  assert common_prefix([1, 2], [1, 2, 3]) == 2
+  assert common_prefix([], [1]) == 0
+
+def test_suggestion_key_is_hashable():
+  sug = Suggestion("test", [["TEFT"], ["T", "EFT"]])
+  assert suggestion_key(sug) == ("test", (("TEFT",), ("T", "EFT")))
+  assert hash(suggestion_key(sug))
+
+def test_rendered_list_keeps_the_common_prefix():
+  rendered = RenderedList()
+  keep, offset, added = rendered.diff(["a", "b", "c"])
+  assert (keep, offset, added) == (0, 0, ["a", "b", "c"])
+  rendered.update(keep, added, [1, 2, 3])
+
+  keep, offset, added = rendered.diff(["a", "b", "d", "e"])
+  assert (keep, offset, added) == (2, 3, ["d", "e"])
+  rendered.update(keep, added, [4, 5])
+  assert rendered.items == ["a", "b", "d", "e"]
+  assert rendered.lengths == [1, 2, 4, 5]
+
+def test_suggestion_cache_is_lru():
+  lookups = []
+
+  def lookup(phrase):
+    lookups.append(phrase)
+    return [phrase.upper()]
+
+  cache = SuggestionCache(lookup, size=2)
+  assert cache.get("a") == ["A"]
+  cache.get("b")
+  cache.get("a")
+  cache.get("c")
+  cache.get("a")
+  cache.get("b")
+  assert lookups == ["a", "b", "c", "b"]
+
+def test_suggestion_cache_clear():
+  lookups = []
+  cache = SuggestionCache(lambda phrase: lookups.append(phrase) or [])
+  cache.suggestions_for(["a"])
+  cache.suggestions_for(["a"])
+  assert lookups == ["a"]
+  cache.clear()
+  cache.suggestions_for(["a"])
+  assert lookups == ["a", "a"]
+
+def test_suggestion_cache_clears_when_the_stamp_changes():
+  lookups = []
+  stamp = [1]
+  cache = SuggestionCache(lambda phrase: lookups.append(phrase) or [],
+    stamp=lambda: stamp[0])
+  cache.suggestions_for(["a"])
+  cache.suggestions_for(["a"])
+  assert lookups == ["a"]
+  stamp[0] = 2
+  cache.suggestions_for(["a"])
+  assert lookups == ["a", "a"]
+
+def test_snapshot_copies_the_tail_under_the_lock():
+  translations = [word(str(i)) for i in range(100)]
+  engine = FakeEngine(translations)
+  tail = snapshot_translations(engine)
+  assert tail == translations[-TRANSLATION_TAIL:]
+  assert tail is not translations
+  assert snapshot_translations(engine, count=None) == translations
+  assert engine.locked == 0
+
+def test_last_words():
+  engine = FakeEngine([word(f"w{i}") for i in range(30)])
+  words = last_words(engine, 3, WORD_RX)
+  assert words == ["w27 ", "w28 ", "w29"]
+
+def test_last_words_falls_back_to_all_translations():
+  translations = [word(f"w{i}") for i in range(5)]
+  translations += [letter("a")] * (TRANSLATION_TAIL + 5)
+  engine = FakeEngine(translations)
+  words = last_words(engine, 3, WORD_RX)
+  assert words == ["w2 ", "w3 ", "w4" + "a" * (TRANSLATION_TAIL + 5)]
+
+def test_suggestions_for_last_words():
+  engine = FakeEngine([word("a"), word("b")])
+  cache = SuggestionCache(lambda phrase: [Suggestion(phrase, [["S"]])] if phrase == "b" else [])
+  assert suggestions_for_last_words(engine, cache) == [Suggestion("b", [["S"]])]
+  cache = SuggestionCache(lambda phrase: [])
+  assert suggestions_for_last_words(engine, cache) == [Suggestion("b", [])]